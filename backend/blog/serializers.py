@@ -1,10 +1,16 @@
+from django.db.models import Count, Q
 from rest_framework import serializers
+from utils.serializers import QueryAwareSerializerMixin, loaded
 from .models import BlogCategory, BlogPost, BlogComment, PopupInquiry, PopupSettings
 
 
-class BlogCategorySerializer(serializers.ModelSerializer):
+class BlogCategorySerializer(QueryAwareSerializerMixin, serializers.ModelSerializer):
     posts_count = serializers.SerializerMethodField()
     
+    annotations = {
+        'published_posts_count': Count('posts', filter=Q(posts__status='published')),
+    }
+    
     class Meta:
         model = BlogCategory
         fields = [
@@ -15,7 +21,7 @@ class BlogCategorySerializer(serializers.ModelSerializer):
         ]
     
     def get_posts_count(self, obj):
-        return obj.posts.filter(status='published').count()
+        return loaded(obj, 'published_posts_count', lambda: obj.posts.filter(status='published').count())
 
 
 class BlogPostListSerializer(serializers.ModelSerializer):
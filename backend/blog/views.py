@@ -15,7 +15,7 @@ class BlogCategoryViewSet(viewsets.ReadOnlyModelViewSet):
     """
     API endpoint for blog categories
     """
-    queryset = BlogCategory.objects.filter(is_active=True)
+    queryset = BlogCategorySerializer.setup_queryset(BlogCategory.objects.filter(is_active=True))
     serializer_class = BlogCategorySerializer
     permission_classes = [AllowAny]
     lookup_field = 'slug'
@@ -58,6 +58,7 @@ INSTALLED_APPS = [
     'ckeditor',
     'ckeditor_uploader',
     'chobighar_backend.apps.ChobigharBackendConfig',  # Core backend with watermark system
+    'utils',  # Shared mixins and the order sequences behind AutoOrderMixin
     'header',
     'footer',
     'contact',
@@ -111,6 +112,13 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Background writers (upload workers, counter flushes) share the file with
+        # requests: take the write lock when a transaction starts and wait for it,
+        # instead of failing with "database is locked" on lock upgrade
+        'OPTIONS': {
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': 20,
+        },
     }
 }
 
@@ -180,6 +188,38 @@ if CUSTOM_CORS_ORIGINS:
 CORS_ALLOW_CREDENTIALS = True
 CORS_ALLOW_ALL_ORIGINS = False
 
+# Cache - file based so every worker process sees the same entries
+# (search index version stamps, cached search results, vendor totals and facets)
+# The default cap of 300 files is far below what those keys need; once
+# MAX_ENTRIES is reached 1/CULL_FREQUENCY of the files are removed.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': config('DJANGO_CACHE_DIR', default=str(BASE_DIR / 'cache')),
+        'TIMEOUT': 60 * 60,
+        'OPTIONS': {
+            'MAX_ENTRIES': config('DJANGO_CACHE_MAX_ENTRIES', default=20000, cast=int),
+            'CULL_FREQUENCY': 10,
+        },
+    }
+}
+
+# Global search - result types are hydrated concurrently and any type still
+# running at the deadline is left out of the page (0 workers = one after another)
+SEARCH_FANOUT_WORKERS = config('SEARCH_FANOUT_WORKERS', default=4, cast=int)
+SEARCH_DEADLINE_MS = config('SEARCH_DEADLINE_MS', default=800, cast=int)
+
+# Admin bulk image uploads are watermarked and saved, and image derivatives
+# written, by this many background threads per process (see utils/uploads.py;
+# 0 = in the request, after it commits)
+UPLOAD_WORKERS = config('UPLOAD_WORKERS', default=2, cast=int)
+# Reverse proxies in front of Django that append to X-Forwarded-For (0: use
+# REMOTE_ADDR); used to tell clients apart for the love-click dedupe
+TRUSTED_PROXY_HOPS = config('TRUSTED_PROXY_HOPS', default=0, cast=int)
+
+# Raw (not yet watermarked) uploads wait here - never inside MEDIA_ROOT, which is public
+UPLOAD_STAGING_DIR = config('UPLOAD_STAGING_DIR', default=str(BASE_DIR / 'upload_staging'))
+
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
@@ -22,6 +22,7 @@ from django.shortcuts import redirect
 from django.http import HttpResponseRedirect
 from .health_views import HealthCheckView, ReadinessCheckView, LivenessCheckView
 from vendor import views as vendor_views
+from utils import views as utils_views
 
 # Redirect function for root URL
 def redirect_to_admin(request):
@@ -32,6 +33,9 @@ urlpatterns = [
     # Root URL - Redirect to Admin Panel
     path('', redirect_to_admin, name='root_redirect'),
     
+    # Bulk upload progress (Admin only) - before admin/ so the admin's catch-all doesn't take it
+    path('admin/uploads/<int:batch_id>/status/', utils_views.upload_batch_status, name='upload_batch_status'),
+    
     # Admin Panel
     path('admin/', admin.site.urls),
     
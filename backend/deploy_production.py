@@ -63,6 +63,16 @@ def main():
             'description': 'Running database migrations'
         },
         
+        # Build the global search index
+        {
+            'command': 'python manage.py rebuild_search_index --settings=chobighar_backend.settings_production',
+            'description': 'Rebuilding search index'
+        },
+        {
+            'command': 'python manage.py rebuild_search_suggestions --settings=chobighar_backend.settings_production',
+            'description': 'Rebuilding search suggestions'
+        },
+        
         # Check deployment readiness
         {
             'command': 'python manage.py check --deploy --settings=chobighar_backend.settings_production',
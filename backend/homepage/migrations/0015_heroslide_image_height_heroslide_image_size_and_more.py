@@ -0,0 +1,28 @@
+# Generated by Django 5.2.6 on 2026-10-18 12:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homepage', '0014_alter_heroslide_order'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='heroslide',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, help_text='Image height in pixels (read from the file at upload)', null=True),
+        ),
+        migrations.AddField(
+            model_name='heroslide',
+            name='image_size',
+            field=models.PositiveIntegerField(blank=True, editable=False, help_text='Image file size in bytes', null=True),
+        ),
+        migrations.AddField(
+            model_name='heroslide',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, help_text='Image width in pixels (read from the file at upload)', null=True),
+        ),
+    ]
@@ -1,7 +1,7 @@
 from django.db import models
-from utils.models import AutoOrderMixin
+from utils.models import AutoOrderMixin, ImageDimensionsMixin
 
-class HeroSlide(AutoOrderMixin):
+class HeroSlide(ImageDimensionsMixin, AutoOrderMixin):
     """Hero slider images for homepage"""
     title = models.CharField(
         max_length=200, 
@@ -1,12 +1,18 @@
 from rest_framework import serializers
+from utils.images import variants
 from .models import HeroSlide, VideoTestimonial, TextTestimonial, FAQ, Achievement, VideoShowcase
 
 class HeroSlideSerializer(serializers.ModelSerializer):
     image_url = serializers.SerializerMethodField()
+    image_variants = serializers.SerializerMethodField()
+    aspect_ratio = serializers.ReadOnlyField()
     
     class Meta:
         model = HeroSlide
-        fields = ['id', 'title', 'image', 'image_url', 'alt_text', 'order', 'caption', 'link_url', 'is_active']
+        fields = [
+            'id', 'title', 'image', 'image_url', 'image_variants', 'image_width', 'image_height', 'image_size',
+            'aspect_ratio', 'alt_text', 'order', 'caption', 'link_url', 'is_active'
+        ]
     
     def get_image_url(self, obj):
         if obj.image:
@@ -14,6 +20,10 @@ class HeroSlideSerializer(serializers.ModelSerializer):
             if request:
                 return request.build_absolute_uri(obj.image.url)
         return None
+    
+    def get_image_variants(self, obj):
+        """Responsive sizes of the slide image (see utils/images.py)"""
+        return variants(obj.image, self.context.get('request'))
 
 class VideoTestimonialSerializer(serializers.ModelSerializer):
     video_url = serializers.SerializerMethodField()
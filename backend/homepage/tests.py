@@ -1,3 +1,42 @@
+import datetime
+
 from django.test import TestCase
 
-# Create your tests here.
+from portfolio.models import Category, Portfolio, PortfolioImage
+
+
+class ShowcaseImageOrderTests(TestCase):
+    """PortfolioImage.order counts within each portfolio, so showcases group images by portfolio"""
+
+    @classmethod
+    def setUpTestData(cls):
+        category = Category.objects.create(id='wedding', name='Weddings')
+        older = cls.portfolio(category, 'older-wedding', datetime.date(2024, 1, 10))
+        newer = cls.portfolio(category, 'newer-wedding', datetime.date(2025, 3, 5))
+        cls.expected = []
+        for portfolio in (older, newer):
+            for number in (1, 2, 3):
+                PortfolioImage.objects.create(
+                    portfolio=portfolio,
+                    image_url=f'https://example.com/{portfolio.pk}/{number}.jpg',
+                    featured=True,
+                )
+        for portfolio in (newer, older):
+            cls.expected += [f'https://example.com/{portfolio.pk}/{number}.jpg' for number in (1, 2, 3)]
+
+    @staticmethod
+    def portfolio(category, slug, date):
+        return Portfolio.objects.create(
+            id=slug, title=slug, subtitle='', category=category,
+            cover_image_url=f'https://example.com/{slug}.jpg',
+            date=date, location='Kolkata', duration='1 Day', guests='100',
+            description='', story='',
+        )
+
+    def test_homepage_showcase(self):
+        response = self.client.get('/api/homepage/showcase-images/')
+        self.assertEqual([image['image'] for image in response.json()['results']], self.expected)
+
+    def test_portfolio_showcase(self):
+        response = self.client.get('/api/portfolio/showcase-images/')
+        self.assertEqual([image['image'] for image in response.json()], self.expected)
@@ -42,7 +42,7 @@ def showcase_images(request):
             is_active=True, 
             featured=True,
             portfolio__is_active=True
-        ).select_related('portfolio').order_by('order', 'created_at')
+        ).select_related('portfolio').order_by('-portfolio__date', 'portfolio', 'order')  # order counts per portfolio
         
         # Apply pagination
         paginator = ShowcaseImagePagination()
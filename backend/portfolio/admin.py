@@ -1,11 +1,12 @@
 import os
 from django.contrib import admin
 from django import forms
-from django.db import models
 from unfold.admin import ModelAdmin, TabularInline, StackedInline
 from django.utils.html import format_html
 from django.utils.safestring import mark_safe
 from django.conf import settings
+from utils import uploads
+from utils.admin import upload_progress
 from .models import Category, Portfolio, PortfolioImage, PortfolioVideo, PortfolioHighlight, PortfolioService
 
 class PortfolioImageInline(TabularInline):
@@ -177,32 +178,21 @@ class PortfolioAdmin(ModelAdmin):
         """Override save_model to handle bulk image upload"""
         super().save_model(request, obj, form, change)
         
-        # Handle bulk image upload if files were provided
+        # Bulk images are staged and saved (watermarked) in the background - see utils/uploads.py
         if 'bulk_images' in request.FILES:
             files = request.FILES.getlist('bulk_images')
-            # Get the current max order for this portfolio
-            max_order = PortfolioImage.objects.filter(portfolio=obj).aggregate(
-                models.Max('order')
-            )['order__max'] or 0
-            
-            uploaded_count = 0
-            for file in files:
-                max_order += 1
-                PortfolioImage.objects.create(
-                    portfolio=obj,
-                    image_file=file,
-                    order=max_order,
-                    is_active=True,
-                    is_cover=False
-                )
-                uploaded_count += 1
-            
-            if uploaded_count > 0:
-                self.message_user(
-                    request,
-                    f"Successfully uploaded {uploaded_count} image(s) to portfolio.",
-                    level='SUCCESS'
-                )
+            batch = uploads.stage('portfolio.portfolioimage', obj, files, request.user)
+            self.message_user(
+                request,
+                f"Queued {batch.total} image(s) for processing. They will appear in the portfolio "
+                f"as they are watermarked - see 'Upload progress' below.",
+                level='SUCCESS'
+            )
+    
+    def upload_progress(self, obj):
+        """Progress of recent bulk uploads to this portfolio"""
+        return upload_progress('portfolio.portfolioimage', obj.pk if obj else None)
+    upload_progress.short_description = '⏳ Upload progress'
     
     def bulk_upload_widget(self, obj):
         """Display bulk upload widget with preview"""
@@ -313,9 +303,9 @@ class PortfolioAdmin(ModelAdmin):
             'description': 'Upload cover image for the portfolio'
         }),
         ('📤 Bulk Upload Portfolio Images', {
-            'fields': ('bulk_upload_widget',),
+            'fields': ('bulk_upload_widget', 'upload_progress'),
             'classes': ('wide',),
-            'description': '⚡ Quick bulk upload: Select multiple images at once to add them all to the portfolio gallery. They will appear in the "Portfolio images" section below after saving.'
+            'description': '⚡ Quick bulk upload: Select multiple images at once to add them all to the portfolio gallery. They are processed in the background after saving and appear in the "Portfolio images" section below as they finish.'
         }),
         ('📅 Event Details', {
             'fields': ('date', 'location', 'duration', 'guests', 'image_count')
@@ -344,7 +334,7 @@ class PortfolioAdmin(ModelAdmin):
         })
     )
     
-    readonly_fields = ('cover_image_preview', 'cta_images_preview', 'bulk_upload_widget')
+    readonly_fields = ('cover_image_preview', 'cta_images_preview', 'bulk_upload_widget', 'upload_progress')
     
     def cover_image_preview(self, obj):
         """Display larger cover image preview in form"""
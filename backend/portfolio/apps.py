@@ -3,4 +3,9 @@ from django.apps import AppConfig
 
 class PortfolioConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'portfolio'
\ No newline at end of file
+    name = 'portfolio'
+
+    def ready(self):
+        """Connect the handlers that reset the cached category counts"""
+        from .signals import register_portfolio_count_signals
+        register_portfolio_count_signals()
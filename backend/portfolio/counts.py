@@ -0,0 +1,45 @@
+"""
+Active portfolio counts per category
+One grouped query builds a {category id: count} map that stays cached until
+a portfolio is saved or deleted (portfolio/signals.py), so the category
+listings cost the same however many categories there are.
+
+The map is stored under the current version token and invalidate() switches
+to a new token, so a map computed before an invalidation can never be
+stored where later reads look for it.
+"""
+import uuid
+
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from .models import Category
+
+VERSION_KEY = 'portfolio:category_counts:version'
+COUNTS_TIMEOUT = 60 * 60
+
+
+def _version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def category_counts():
+    """{category id: number of active portfolios} over every category"""
+    key = f'portfolio:category_counts:{_version()}'
+    counts = cache.get(key)
+    if counts is None:
+        counts = dict(
+            Category.objects.order_by()
+            .annotate(count=Count('portfolios', filter=Q(portfolios__is_active=True)))
+            .values_list('id', 'count')
+        )
+        cache.set(key, counts, COUNTS_TIMEOUT)
+    return counts
+
+
+def invalidate():
+    cache.set(VERSION_KEY, uuid.uuid4().hex, None)
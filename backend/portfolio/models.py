@@ -2,7 +2,8 @@ from django.db import models
 from django.utils.text import slugify
 from django.core.validators import RegexValidator
 from django.core.exceptions import ValidationError
-from utils.models import AutoOrderMixin
+from utils.models import AutoOrderMixin, ImageDimensionsMixin
+from utils.counters import WriteBehindCounter
 import os
 
 def portfolio_cover_upload_to(instance, filename):
@@ -177,15 +178,23 @@ class Portfolio(AutoOrderMixin):
         return self.portfolio_services.all().order_by('order')
     
     def increment_love(self):
-        """Increment love count by 1"""
-        self.love_count += 1
-        self.save(update_fields=['love_count', 'updated_at'])
-        return self.love_count
+        """Increment love count by 1 (written behind, see utils/counters.py)"""
+        return love_counter.increment(self)
+    
+    @property
+    def current_love_count(self):
+        """Stored love count plus clicks not yet flushed"""
+        return love_counter.value(self)
+
+
+love_counter = WriteBehindCounter(Portfolio, 'love_count')
 
 
-class PortfolioImage(AutoOrderMixin):
+class PortfolioImage(ImageDimensionsMixin, AutoOrderMixin):
     """Images within each portfolio"""
     portfolio = models.ForeignKey(Portfolio, on_delete=models.CASCADE, related_name='portfolio_images')
+    order_scope = 'portfolio'
+    dimensions_field = 'image_file'
     
     # Support both file upload and URL for images
     image_file = models.ImageField(
@@ -251,6 +260,7 @@ def portfolio_video_thumbnail_upload_to(instance, filename):
 class PortfolioVideo(AutoOrderMixin):
     """Videos within each portfolio"""
     portfolio = models.ForeignKey(Portfolio, on_delete=models.CASCADE, related_name='portfolio_videos')
+    order_scope = 'portfolio'
     video_id = models.CharField(max_length=100, help_text="YouTube video ID")
     title = models.CharField(max_length=200)
     description = models.TextField(blank=True)
@@ -269,6 +279,7 @@ class PortfolioVideo(AutoOrderMixin):
 class PortfolioHighlight(AutoOrderMixin):
     """Highlights/bullet points for each portfolio"""
     portfolio = models.ForeignKey(Portfolio, on_delete=models.CASCADE, related_name='portfolio_highlights')
+    order_scope = 'portfolio'
     highlight_text = models.CharField(max_length=300)
     created_at = models.DateTimeField(auto_now_add=True)
 
@@ -282,6 +293,7 @@ class PortfolioHighlight(AutoOrderMixin):
 class PortfolioService(AutoOrderMixin):
     """Services provided for each portfolio"""
     portfolio = models.ForeignKey(Portfolio, on_delete=models.CASCADE, related_name='portfolio_services')
+    order_scope = 'portfolio'
     service_name = models.CharField(max_length=200)
     created_at = models.DateTimeField(auto_now_add=True)
     created_at = models.DateTimeField(auto_now_add=True)
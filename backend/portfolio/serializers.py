@@ -1,7 +1,11 @@
+from django.db.models import Prefetch
 from rest_framework import serializers
+from utils.images import variants
+from utils.serializers import QueryAwareSerializerMixin, loaded
+from .counts import category_counts
 from .models import Category, Portfolio, PortfolioImage, PortfolioVideo, PortfolioHighlight, PortfolioService
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(QueryAwareSerializerMixin, serializers.ModelSerializer):
     portfolio_count = serializers.SerializerMethodField()
     
     class Meta:
@@ -9,19 +13,28 @@ class CategorySerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'description', 'is_active', 'order', 'portfolio_count']
     
     def get_portfolio_count(self, obj):
-        return obj.portfolios.filter(is_active=True).count()
+        return category_counts().get(obj.pk, 0)
 
 
 class PortfolioImageSerializer(serializers.ModelSerializer):
     image = serializers.SerializerMethodField()
+    image_variants = serializers.SerializerMethodField()
+    aspect_ratio = serializers.ReadOnlyField()
     
     class Meta:
         model = PortfolioImage
-        fields = ['id', 'image', 'caption', 'order', 'is_cover', 'featured']
+        fields = [
+            'id', 'image', 'image_variants', 'image_width', 'image_height', 'image_size', 'aspect_ratio',
+            'caption', 'order', 'is_cover', 'featured'
+        ]
     
     def get_image(self, obj):
         """Return the image URL (either uploaded file or URL)"""
         return obj.image
+    
+    def get_image_variants(self, obj):
+        """Responsive sizes of an uploaded image (None for image URLs)"""
+        return variants(obj.image_file)
 
 
 class PortfolioVideoSerializer(serializers.ModelSerializer):
@@ -42,10 +55,18 @@ class PortfolioServiceSerializer(serializers.ModelSerializer):
         fields = ['id', 'service_name', 'order']
 
 
-class PortfolioListSerializer(serializers.ModelSerializer):
+class PortfolioListSerializer(QueryAwareSerializerMixin, serializers.ModelSerializer):
     """Simplified serializer for portfolio list view"""
+    select_related_fields = ('category',)
+    field_sources = {
+        'category': ('category__name',),
+        'category_id': ('category',),
+        'cover_image': ('cover_image_file', 'cover_image_url'),
+        'love_count': ('love_count',),
+    }
     category = serializers.StringRelatedField()
     category_id = serializers.CharField(source='category.id', read_only=True)
+    love_count = serializers.IntegerField(source='current_love_count', read_only=True)
     
     class Meta:
         model = Portfolio
@@ -56,19 +77,42 @@ class PortfolioListSerializer(serializers.ModelSerializer):
         ]
 
 
-class PortfolioDetailSerializer(serializers.ModelSerializer):
+class PortfolioDetailSerializer(QueryAwareSerializerMixin, serializers.ModelSerializer):
     """Detailed serializer for individual portfolio view"""
     category = CategorySerializer(read_only=True)
-    images = PortfolioImageSerializer(many=True, read_only=True)
-    videos = PortfolioVideoSerializer(many=True, read_only=True)
-    highlights = PortfolioHighlightSerializer(many=True, read_only=True)
-    services = PortfolioServiceSerializer(many=True, read_only=True)
+    images = serializers.SerializerMethodField()
+    videos = serializers.SerializerMethodField()
+    highlights = serializers.SerializerMethodField()
+    services = serializers.SerializerMethodField()
+    
+    select_related_fields = ('category',)
+    
+    # Same rows as the Portfolio.images/videos/highlights/services properties,
+    # loaded once per queryset instead of once per portfolio
+    field_prefetches = {
+        'images': (Prefetch('portfolio_images', queryset=PortfolioImage.objects.filter(is_active=True).order_by('order'), to_attr='active_images'),),
+        'videos': (Prefetch('portfolio_videos', queryset=PortfolioVideo.objects.filter(is_active=True).order_by('order'), to_attr='active_videos'),),
+        'highlights': (Prefetch('portfolio_highlights', queryset=PortfolioHighlight.objects.order_by('order'), to_attr='ordered_highlights'),),
+        'services': (Prefetch('portfolio_services', queryset=PortfolioService.objects.order_by('order'), to_attr='ordered_services'),),
+    }
+    expandable_fields = ('images', 'videos', 'highlights', 'services')
+    
+    field_sources = {
+        'category': ('category',),
+        'cover_image': ('cover_image_file', 'cover_image_url'),
+        'love_count': ('love_count',),
+        'cta_image_1_url': ('cta_image_1',),
+        'cta_image_2_url': ('cta_image_2',),
+        'cta_image_3_url': ('cta_image_3',),
+        'cta_image_4_url': ('cta_image_4',),
+    }
     
     # CTA image URLs
     cta_image_1_url = serializers.SerializerMethodField()
     cta_image_2_url = serializers.SerializerMethodField()
     cta_image_3_url = serializers.SerializerMethodField()
     cta_image_4_url = serializers.SerializerMethodField()
+    love_count = serializers.IntegerField(source='current_love_count', read_only=True)
     
     class Meta:
         model = Portfolio
@@ -82,6 +126,22 @@ class PortfolioDetailSerializer(serializers.ModelSerializer):
             'promotional_video_id'
         ]
     
+    def get_images(self, obj):
+        images = loaded(obj, 'active_images', lambda: obj.images)
+        return PortfolioImageSerializer(images, many=True, context=self.context).data
+    
+    def get_videos(self, obj):
+        videos = loaded(obj, 'active_videos', lambda: obj.videos)
+        return PortfolioVideoSerializer(videos, many=True, context=self.context).data
+    
+    def get_highlights(self, obj):
+        highlights = loaded(obj, 'ordered_highlights', lambda: obj.highlights)
+        return PortfolioHighlightSerializer(highlights, many=True, context=self.context).data
+    
+    def get_services(self, obj):
+        services = loaded(obj, 'ordered_services', lambda: obj.services)
+        return PortfolioServiceSerializer(services, many=True, context=self.context).data
+    
     def get_cta_image_1_url(self, obj):
         try:
             return obj.cta_image_1.url if obj.cta_image_1 else None
@@ -0,0 +1,22 @@
+"""
+Signal handlers that reset the cached portfolio counts per category
+"""
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+
+from . import counts
+from .models import Portfolio
+
+
+def portfolio_count_handler(sender, instance, **kwargs):
+    """A portfolio was added, removed, (de)activated or moved - recount on next read"""
+    transaction.on_commit(counts.invalidate)
+
+
+def register_portfolio_count_signals():
+    """
+    Connect the count handlers
+    Call this in apps.py ready() method
+    """
+    post_save.connect(portfolio_count_handler, sender=Portfolio, dispatch_uid='portfolio_count_save')
+    post_delete.connect(portfolio_count_handler, sender=Portfolio, dispatch_uid='portfolio_count_delete')
@@ -0,0 +1,129 @@
+import datetime
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from . import counts
+from .models import Category, Portfolio, PortfolioImage
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class PortfolioQueryPlanTests(TestCase):
+    """Portfolio pages load their category and child rows in a fixed number of queries"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(id='wedding', name='Weddings')
+        cls.small = cls.portfolio('small-wedding', images=1)
+        cls.large = cls.portfolio('large-wedding', images=6)
+
+    @classmethod
+    def portfolio(cls, slug, images):
+        portfolio = Portfolio.objects.create(
+            id=slug, title=slug, subtitle='', category=cls.category,
+            cover_image_url=f'https://example.com/{slug}.jpg',
+            date=datetime.date(2025, 3, 5), location='Kolkata', duration='1 Day', guests='100',
+            description='', story='',
+        )
+        for number in range(1, images + 1):
+            PortfolioImage.objects.create(portfolio=portfolio, image_url=f'https://example.com/{slug}/{number}.jpg')
+        return portfolio
+
+    def setUp(self):
+        cache.clear()
+
+    def get(self, url, queries, **params):
+        with self.assertNumQueries(queries):
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_detail_query_count_does_not_grow_with_images(self):
+        # Portfolio joined with its category, then one query each for
+        # images, videos, highlights and services; the first request also
+        # fills the cached category counts
+        self.get(f'/api/portfolio/portfolios/{self.small.pk}/', 6)
+        small = self.get(f'/api/portfolio/portfolios/{self.small.pk}/', 5)
+        large = self.get(f'/api/portfolio/portfolios/{self.large.pk}/', 5)
+
+        self.assertEqual((len(small['images']), len(large['images'])), (1, 6))
+        self.assertEqual((large['category']['name'], large['category']['portfolio_count']), ('Weddings', 2))
+
+    def test_list_query_count_does_not_grow_with_portfolios(self):
+        # Portfolios joined with their categories; image_count is a stored column
+        self.get('/api/portfolio/portfolios/', 1)
+        for number in range(3):
+            self.portfolio(f'wedding-{number}', images=2)
+        listing = self.get('/api/portfolio/portfolios/', 1)
+
+        self.assertEqual(len(listing), 5)
+
+    def test_detail_fields_drop_the_join_and_prefetches(self):
+        with self.assertNumQueries(1) as queries:
+            response = self.client.get(f'/api/portfolio/portfolios/{self.large.pk}/', {'fields': 'title'})
+        self.assertEqual(response.json(), {'title': 'large-wedding'})
+        self.assertNotIn('JOIN', queries.captured_queries[0]['sql'])
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class CategoryCountTests(TestCase):
+    """Cached portfolio counts per category are dropped by portfolio saves and deletes"""
+
+    def setUp(self):
+        cache.clear()
+        self.weddings = Category.objects.create(id='wedding', name='Weddings')
+        self.portraits = Category.objects.create(id='portrait', name='Portraits')
+
+    def create(self, slug, category):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Portfolio.objects.create(
+                id=slug, title=slug, subtitle='', category=category,
+                cover_image_url=f'https://example.com/{slug}.jpg',
+                date=datetime.date(2025, 3, 5), location='Kolkata', duration='1 Day', guests='100',
+                description='', story='',
+            )
+
+    def save(self, portfolio):
+        with self.captureOnCommitCallbacks(execute=True):
+            portfolio.save()
+
+    def assertCounts(self, weddings, portraits):
+        self.assertEqual(counts.category_counts(), {'wedding': weddings, 'portrait': portraits})
+        # Served from the cache until the next change
+        with self.assertNumQueries(0):
+            counts.category_counts()
+
+    def test_saves_and_deletes_invalidate_the_counts(self):
+        self.assertCounts(0, 0)
+        portfolio = self.create('first-wedding', self.weddings)
+        self.create('second-wedding', self.weddings)
+        self.assertCounts(2, 0)
+
+        portfolio.is_active = False
+        self.save(portfolio)
+        self.assertCounts(1, 0)
+
+        portfolio.is_active = True
+        portfolio.category = self.portraits
+        self.save(portfolio)
+        self.assertCounts(1, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            portfolio.delete()
+        self.assertCounts(1, 0)
+
+    def test_counts_computed_before_an_invalidation_are_not_reused(self):
+        queryset = Category.objects.get_queryset()
+
+        def invalidated_mid_query(*fields):
+            # A portfolio save commits while the map is being computed
+            counts.invalidate()
+            return queryset.order_by(*fields)
+
+        with mock.patch.object(Category.objects, 'order_by', side_effect=invalidated_mid_query):
+            counts.category_counts()
+        with self.assertNumQueries(1):
+            counts.category_counts()
@@ -3,6 +3,8 @@ from rest_framework.decorators import action, api_view
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db.models import Q
+from utils.bloom import love_clicks, client_fingerprint
+from .counts import category_counts
 from .models import Category, Portfolio, PortfolioImage, PortfolioVideo
 from .serializers import (
     CategorySerializer, PortfolioListSerializer, PortfolioDetailSerializer, 
@@ -14,14 +16,16 @@ class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
     ViewSet for portfolio categories
     Provides list and retrieve actions
     """
-    queryset = Category.objects.filter(is_active=True)
+    queryset = CategorySerializer.setup_queryset(Category.objects.filter(is_active=True))
     serializer_class = CategorySerializer
     
     @action(detail=True, methods=['get'])
     def portfolios(self, request, pk=None):
         """Get all portfolios for a specific category"""
         category = self.get_object()
-        portfolios = Portfolio.objects.filter(category=category, is_active=True)
+        portfolios = PortfolioListSerializer.setup_queryset(
+            Portfolio.objects.filter(category=category, is_active=True)
+        )
         serializer = PortfolioListSerializer(portfolios, many=True)
         return Response(serializer.data)
 
@@ -30,6 +34,7 @@ class PortfolioViewSet(viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for portfolios
     Provides list, retrieve, and filtering capabilities
+    `?fields=`/`?expand=` trim the payload and the queries behind it (see utils/serializers.py)
     """
     queryset = Portfolio.objects.filter(is_active=True)
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -46,7 +51,7 @@ class PortfolioViewSet(viewsets.ReadOnlyModelViewSet):
     
     def get_queryset(self):
         """Filter queryset based on query parameters"""
-        queryset = super().get_queryset()
+        queryset = self.get_serializer_class().setup_queryset(super().get_queryset(), self.request)
         
         # Filter by category if provided
         category = self.request.query_params.get('category', None)
@@ -63,7 +68,7 @@ class PortfolioViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=False, methods=['get'])
     def featured(self, request):
         """Get featured portfolios"""
-        featured_portfolios = self.queryset.filter(featured=True)[:6]
+        featured_portfolios = self.get_serializer_class().setup_queryset(self.queryset.filter(featured=True))[:6]
         serializer = self.get_serializer(featured_portfolios, many=True)
         return Response(serializer.data)
     
@@ -71,23 +76,21 @@ class PortfolioViewSet(viewsets.ReadOnlyModelViewSet):
     def categories_with_count(self, request):
         """Get categories with portfolio counts"""
         categories = Category.objects.filter(is_active=True)
-        category_data = []
+        counts = category_counts()
         
         # Add 'All' category
-        total_count = self.queryset.count()
-        category_data.append({
+        category_data = [{
             'id': 'all',
             'name': 'All Work',
-            'count': total_count
-        })
+            'count': sum(counts.values())
+        }]
         
         # Add other categories
         for category in categories:
-            count = self.queryset.filter(category=category).count()
             category_data.append({
                 'id': category.id,
                 'name': category.name,
-                'count': count
+                'count': counts.get(category.id, 0)
             })
         
         return Response(category_data)
@@ -96,19 +99,27 @@ class PortfolioViewSet(viewsets.ReadOnlyModelViewSet):
     def related(self, request, pk=None):
         """Get related portfolios from the same category"""
         portfolio = self.get_object()
-        related = Portfolio.objects.filter(
+        related = PortfolioListSerializer.setup_queryset(Portfolio.objects.filter(
             category=portfolio.category,
             is_active=True
-        ).exclude(pk=portfolio.pk)[:6]
+        )).exclude(pk=portfolio.pk)[:6]
         
         serializer = PortfolioListSerializer(related, many=True)
         return Response(serializer.data)
     
     @action(detail=True, methods=['post'])
     def love(self, request, pk=None):
-        """Increment love count for a portfolio"""
+        """Increment love count for a portfolio (repeat clicks from one client are dropped)"""
+        click = f'{client_fingerprint(request)}|portfolio:{pk}'
+        if love_clicks.seen(click):
+            return Response({
+                'success': False,
+                'error': 'Already loved'
+            }, status=status.HTTP_409_CONFLICT)
+        
         portfolio = self.get_object()
         new_count = portfolio.increment_love()
+        love_clicks.add(click)
         
         return Response({
             'success': True,
@@ -124,7 +135,7 @@ def showcase_images(request):
         is_active=True,
         featured=True,
         portfolio__is_active=True
-    ).order_by('order', 'created_at')  # Order by order field and creation date
+    ).order_by('-portfolio__date', 'portfolio', 'order')  # Latest portfolios first, order counts per portfolio
     
     serializer = PortfolioImageSerializer(images, many=True)
     return Response(serializer.data)
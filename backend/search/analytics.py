@@ -0,0 +1,142 @@
+"""
+Query analytics for global search
+record() only appends to an in-memory buffer; a daemon thread per process
+writes the buffer to SearchQueryLog with one bulk insert every FLUSH_INTERVAL
+seconds (or sooner once FLUSH_SIZE entries are waiting), so the request path
+never waits on an INSERT. rollup() aggregates the log into SearchTermStat,
+cache_stats() into result cache hit and miss counts.
+"""
+import atexit
+from datetime import timedelta
+import logging
+import threading
+
+from django.db import connection, transaction
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+
+from .models import SearchQueryLog, SearchTermStat
+from .utils import normalize_text
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = 10
+FLUSH_SIZE = 200
+
+# Entries kept while the database is unreachable; the oldest are dropped beyond this
+MAX_BUFFERED = 5000
+
+ROLLUP_DAYS = 30
+
+_buffer = []
+_buffer_lock = threading.Lock()
+_flush_wanted = threading.Event()
+_flusher = None
+
+
+def record(query, result_count, latency_ms, type_hits=None, fuzzy=False, cache_hit=False):
+    """Queue one search for the log (never touches the database)"""
+    entry = SearchQueryLog(
+        query=normalize_text(query)[:200],
+        result_count=result_count,
+        latency_ms=int(latency_ms),
+        type_hits=type_hits or {},
+        fuzzy=fuzzy,
+        cache_hit=cache_hit,
+        created_at=timezone.now(),
+    )
+    with _buffer_lock:
+        _buffer.append(entry)
+        if len(_buffer) > MAX_BUFFERED:
+            del _buffer[:len(_buffer) - MAX_BUFFERED]
+        size = len(_buffer)
+    _ensure_flusher()
+    if size >= FLUSH_SIZE:
+        _flush_wanted.set()
+
+
+def flush():
+    """Write every buffered entry with one bulk insert; returns the number written"""
+    with _buffer_lock:
+        entries = _buffer[:]
+        del _buffer[:]
+    if not entries:
+        return 0
+    try:
+        SearchQueryLog.objects.bulk_create(entries, batch_size=500)
+    except Exception as e:
+        logger.error(f"❌ Error writing {len(entries)} search log entries: {str(e)}")
+        with _buffer_lock:
+            _buffer[:0] = entries[-MAX_BUFFERED:]
+        return 0
+    return len(entries)
+
+
+def _flush_loop():
+    while True:
+        _flush_wanted.wait(FLUSH_INTERVAL)
+        _flush_wanted.clear()
+        try:
+            flush()
+        finally:
+            connection.close()
+
+
+def _ensure_flusher():
+    global _flusher
+    if _flusher is None:
+        with _buffer_lock:
+            if _flusher is None:
+                _flusher = threading.Thread(target=_flush_loop, name='search-log-flush', daemon=True)
+                _flusher.start()
+                atexit.register(flush)
+
+
+def rollup(days=ROLLUP_DAYS):
+    """
+    Rebuild SearchTermStat from the last `days` of the log
+    Returns the number of distinct terms
+    """
+    since = timezone.now() - timedelta(days=days)
+    rows = SearchQueryLog.objects.filter(created_at__gte=since).values('query').annotate(
+        searches=Count('id'),
+        zero_result_searches=Count('id', filter=Q(result_count=0)),
+        last_searched_at=Max('created_at'),
+    )
+    stats = [
+        SearchTermStat(
+            term=row['query'],
+            searches=row['searches'],
+            zero_result_searches=row['zero_result_searches'],
+            last_searched_at=row['last_searched_at'],
+        )
+        for row in rows
+    ]
+    with transaction.atomic():
+        SearchTermStat.objects.all().delete()
+        SearchTermStat.objects.bulk_create(stats, batch_size=500)
+    return len(stats)
+
+
+def prune(days):
+    """Delete log entries older than `days`; returns the number deleted"""
+    deleted, _ = SearchQueryLog.objects.filter(
+        created_at__lt=timezone.now() - timedelta(days=days)
+    ).delete()
+    return deleted
+
+
+def cache_stats(days=1):
+    """Result cache hits and misses over the last `days` of the log"""
+    since = timezone.now() - timedelta(days=days)
+    counts = SearchQueryLog.objects.filter(created_at__gte=since).aggregate(
+        hits=Count('id', filter=Q(cache_hit=True)),
+        misses=Count('id', filter=Q(cache_hit=False)),
+    )
+    lookups = counts['hits'] + counts['misses']
+    return {
+        'days': days,
+        'hits': counts['hits'],
+        'misses': counts['misses'],
+        'hit_rate': round(counts['hits'] / lookups, 4) if lookups else None,
+    }
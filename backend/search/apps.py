@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class SearchConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'search'
+
+    def ready(self):
+        """Connect the signals that keep the search index in sync"""
+        from .signals import register_search_signals
+        register_search_signals()
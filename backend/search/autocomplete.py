@@ -0,0 +1,101 @@
+"""
+Prefix typeahead for the search box
+Each worker keeps a sorted array of searchable titles in memory and answers
+prefix lookups with a binary search. A version stamp in the shared cache is
+bumped whenever a source model changes; a worker that sees a new stamp
+rebuilds its array on the next lookup.
+"""
+from bisect import bisect_left
+import logging
+
+from vendor.models import VendorProfile, VendorCategory, VendorSubCategory, VendorService
+from portfolio.models import Portfolio
+from photoshootpage.models import PhotoshootService
+from .utils import VersionedIndex, normalize_text
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = 'search:autocomplete:version'
+
+# Models whose titles feed the typeahead
+SOURCE_MODELS = (
+    VendorProfile, VendorCategory, VendorSubCategory, VendorService, Portfolio, PhotoshootService
+)
+
+
+def _load_entries():
+    """(title, type, url) for every active title shown in the typeahead"""
+    entries = []
+    for name, slug in VendorProfile.objects.filter(is_active=True).values_list('name', 'slug'):
+        entries.append((name, 'vendor', f'/vendor/{slug}'))
+    for name, slug in VendorCategory.objects.filter(is_active=True).values_list('name', 'slug'):
+        entries.append((name, 'vendor_category', f'/vendors?category={slug}'))
+    for name, slug in VendorSubCategory.objects.filter(is_active=True).values_list('name', 'slug'):
+        entries.append((name, 'vendor_subcategory', f'/vendors?subcategory={slug}'))
+    for title, portfolio_id in Portfolio.objects.filter(is_active=True).values_list('title', 'id'):
+        entries.append((title, 'portfolio', f'/portfolio/{portfolio_id}'))
+    for name, slug in VendorService.objects.filter(
+        is_active=True, vendor__is_active=True
+    ).values_list('name', 'vendor__slug'):
+        entries.append((name, 'vendor_service', f'/vendor/{slug}'))
+    for title in PhotoshootService.objects.filter(is_active=True).values_list('title', flat=True):
+        entries.append((title, 'photoshoot_service', '/photoshoot'))
+    return entries
+
+
+class AutocompleteIndex:
+    """
+    Sorted array of (key, entry number) pairs
+    Every word start of a title is a key, so "hall" finds "Banquet Halls"
+    """
+
+    def __init__(self, entries):
+        self.entries = entries
+        pairs = []
+        for number, (title, _, _) in enumerate(entries):
+            words = normalize_text(title).split(' ')
+            for position in range(len(words)):
+                pairs.append((' '.join(words[position:]), number))
+        pairs.sort()
+        self.keys = [key for key, _ in pairs]
+        self.numbers = [number for _, number in pairs]
+
+    def lookup(self, prefix, limit=8):
+        """Titles with a word starting with prefix, whole-title matches first"""
+        prefix = normalize_text(prefix)
+        if not prefix:
+            return []
+
+        starts, others, seen = [], [], set()
+        position = bisect_left(self.keys, prefix)
+        while position < len(self.keys) and self.keys[position].startswith(prefix):
+            number = self.numbers[position]
+            if number not in seen:
+                seen.add(number)
+                title = self.entries[number][0]
+                (starts if normalize_text(title).startswith(prefix) else others).append(number)
+            position += 1
+
+        return [
+            {'title': title, 'type': entry_type, 'url': url}
+            for title, entry_type, url in (self.entries[number] for number in (starts + others)[:limit])
+        ]
+
+
+def _build_index():
+    index = AutocompleteIndex(_load_entries())
+    logger.info(f"🔎 Autocomplete index rebuilt with {len(index.entries)} titles")
+    return index
+
+
+_index = VersionedIndex(VERSION_KEY, _build_index)
+
+
+def get_index():
+    """This worker's index, rebuilt if another process bumped the version"""
+    return _index.get()
+
+
+def bump_version():
+    """Invalidate every worker's index (called when a source model changes)"""
+    _index.bump()
@@ -0,0 +1,145 @@
+"""
+Typo-tolerant fallback for global search
+A character-trigram index over vendor names/locations/types, portfolio
+titles/locations and category names. Each distinct word gets an id; every
+trigram maps to a sorted array('I') of word ids and every word maps to an
+array of entity numbers, so the whole index is a handful of flat arrays.
+Used by global_search only when the exact (FTS) pass finds nothing, e.g.
+"banqet" or "kolkatta".
+"""
+from array import array
+import logging
+
+from vendor.models import VendorProfile, VendorCategory, VendorSubCategory
+from portfolio.models import Portfolio, Category as PortfolioCategory
+from .utils import VersionedIndex, split_words
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = 'search:fuzzy:version'
+
+# Models whose text feeds the trigram index
+SOURCE_MODELS = (VendorProfile, VendorCategory, VendorSubCategory, Portfolio, PortfolioCategory)
+
+# Minimum trigram similarity (shared / union) for a word to count as a match
+MIN_SIMILARITY = 0.4
+
+MIN_WORD_LENGTH = 3
+
+
+def trigrams(word):
+    """Distinct trigrams of a word padded with spaces ("kol" -> "  k", " ko", "kol", "ol ")"""
+    padded = f'  {word} '
+    return {padded[position:position + 3] for position in range(len(padded) - 2)}
+
+
+def _load_entities():
+    """(entity_type, object_id, text) for every active object in the fuzzy index"""
+    entities = []
+    for pk, name, location, vendor_type in VendorProfile.objects.filter(
+        is_active=True
+    ).values_list('pk', 'name', 'location', 'type'):
+        entities.append(('vendor', str(pk), f'{name} {location} {vendor_type}'))
+    for pk, title, location in Portfolio.objects.filter(is_active=True).values_list('pk', 'title', 'location'):
+        entities.append(('portfolio', str(pk), f'{title} {location}'))
+    for pk, name in VendorCategory.objects.filter(is_active=True).values_list('pk', 'name'):
+        entities.append(('vendor_category', str(pk), name))
+    for pk, name in VendorSubCategory.objects.filter(is_active=True).values_list('pk', 'name'):
+        entities.append(('vendor_subcategory', str(pk), name))
+    for pk, name in PortfolioCategory.objects.filter(is_active=True).values_list('pk', 'name'):
+        entities.append(('portfolio_category', str(pk), name))
+    return entities
+
+
+class TrigramIndex:
+    """Array-backed trigram postings over the words of the indexed entities"""
+
+    def __init__(self, entities):
+        self.entities = [(entity_type, object_id) for entity_type, object_id, _ in entities]
+
+        word_ids = {}
+        word_entities = []
+        for number, (_, _, text) in enumerate(entities):
+            for word in set(split_words(text)):
+                if len(word) < MIN_WORD_LENGTH:
+                    continue
+                if word not in word_ids:
+                    word_ids[word] = len(word_ids)
+                    word_entities.append([])
+                word_entities[word_ids[word]].append(number)
+
+        postings = {}
+        self.word_trigram_counts = array('H')
+        for word, word_id in word_ids.items():
+            grams = trigrams(word)
+            self.word_trigram_counts.append(len(grams))
+            for gram in grams:
+                postings.setdefault(gram, []).append(word_id)
+
+        # Word ids are assigned in increasing order, so every posting list is already sorted
+        self.postings = {gram: array('I', ids) for gram, ids in postings.items()}
+        self.word_entities = [array('I', numbers) for numbers in word_entities]
+
+    def similar_words(self, token):
+        """{word_id: similarity} for indexed words close to token"""
+        grams = trigrams(token)
+        shared = {}
+        for gram in grams:
+            for word_id in self.postings.get(gram, ()):
+                shared[word_id] = shared.get(word_id, 0) + 1
+
+        similar = {}
+        for word_id, count in shared.items():
+            similarity = count / (len(grams) + self.word_trigram_counts[word_id] - count)
+            if similarity >= MIN_SIMILARITY:
+                similar[word_id] = similarity
+        return similar
+
+    def rank(self, query):
+        """
+        Entities whose words resemble the query tokens
+        Returns [(entity_type, object_id, score), ...] best first - an entity
+        scores the best similarity it reaches for each query token, summed
+        """
+        tokens = [token for token in split_words(query) if len(token) >= MIN_WORD_LENGTH]
+        scores = {}
+        for token in tokens:
+            best = {}
+            for word_id, similarity in self.similar_words(token).items():
+                for number in self.word_entities[word_id]:
+                    if similarity > best.get(number, 0):
+                        best[number] = similarity
+            for number, similarity in best.items():
+                scores[number] = scores.get(number, 0) + similarity
+
+        ranked = sorted(scores.items(), key=lambda item: -item[1])
+        return [
+            (*self.entities[number], round(score, 4))
+            for number, score in ranked
+        ]
+
+
+def _build_index():
+    index = TrigramIndex(_load_entities())
+    logger.info(
+        f"🔎 Trigram index rebuilt: {len(index.entities)} entities, "
+        f"{len(index.word_entities)} words, {len(index.postings)} trigrams"
+    )
+    return index
+
+
+_index = VersionedIndex(VERSION_KEY, _build_index)
+
+
+def get_index():
+    """This worker's index, rebuilt if another process bumped the version"""
+    return _index.get()
+
+
+def bump_version():
+    """Invalidate every worker's index (called when a source model changes)"""
+    _index.bump()
+
+
+def rank(query):
+    return get_index().rank(query)
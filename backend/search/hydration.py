@@ -0,0 +1,370 @@
+"""
+Result hydration for global search
+Turns ranked index hits into result dicts. Every entity type is loaded with
+one query; first images, cover images and counts are annotated onto that
+query instead of being looked up per hit, so the query count stays flat no
+matter how many results come back. Each hydrator returns {object_id: result}.
+
+The hydrators for the types on a page run concurrently on a shared thread pool
+(settings.SEARCH_FANOUT_WORKERS) and are given settings.SEARCH_DEADLINE_MS in
+total; a type that misses the deadline is reported instead of waited for.
+"""
+from concurrent.futures import ThreadPoolExecutor, wait
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count, OuterRef, Q, Subquery
+
+from vendor.models import VendorProfile, VendorCategory, VendorSubCategory, VendorImage, VendorService
+from portfolio.models import Portfolio, Category as PortfolioCategory, PortfolioImage
+from photoshootpage.models import PhotoshootService
+
+logger = logging.getLogger(__name__)
+
+
+def _fetch(queryset, ids):
+    """Load the objects for a list of indexed ids (stale ids are simply missing)"""
+    return queryset.filter(pk__in=ids)
+
+
+def _media_url(request, model, field_name, name):
+    """Absolute URL for a file name read from an annotation"""
+    if not name:
+        return None
+    storage = model._meta.get_field(field_name).storage
+    return request.build_absolute_uri(storage.url(name))
+
+
+def _truncate(text, length=150):
+    return text[:length] + '...' if len(text) > length else text
+
+
+def _first_vendor_image(vendor_ref):
+    """Subquery: file name of the first active gallery image of a vendor"""
+    return Subquery(
+        VendorImage.objects.filter(
+            vendor=vendor_ref, is_active=True
+        ).order_by('created_at', 'id').values('image')[:1]
+    )
+
+
+def hydrate_vendors(request, ids):
+    vendors = _fetch(
+        VendorProfile.objects.filter(is_active=True).select_related(
+            'category', 'subcategory'
+        ).annotate(first_image=_first_vendor_image(OuterRef('pk'))),
+        ids
+    )
+    return {str(vendor.pk): {
+        'type': 'vendor',
+        'id': str(vendor.id),
+        'title': vendor.name,
+        'subtitle': vendor.tagline,
+        'description': _truncate(vendor.description),
+        'image': _media_url(request, VendorImage, 'image', vendor.first_image),
+        'url': f'/vendor/{vendor.slug}',
+        'category': vendor.category.name if vendor.category else 'Vendor',
+        'subcategory': vendor.subcategory.name if vendor.subcategory else None,
+        'location': vendor.location,
+        'rating': float(vendor.rating) if vendor.rating else None,
+        'price_range': vendor.price_range,
+        'vendor_type': vendor.type
+    } for vendor in vendors}
+
+
+def hydrate_vendor_categories(request, ids):
+    categories = _fetch(
+        VendorCategory.objects.filter(is_active=True).annotate(
+            active_vendor_count=Count('vendor_profiles', filter=Q(vendor_profiles__is_active=True))
+        ),
+        ids
+    )
+    return {str(category.pk): {
+        'type': 'vendor_category',
+        'id': str(category.id),
+        'title': category.name,
+        'subtitle': f"{category.active_vendor_count} vendors available",
+        'description': _truncate(category.description),
+        'image': request.build_absolute_uri(category.image.url) if category.image else None,
+        'url': f'/vendors?category={category.slug}',
+        'category': 'Category',
+        'vendor_count': category.active_vendor_count
+    } for category in categories}
+
+
+def hydrate_vendor_subcategories(request, ids):
+    subcategories = _fetch(
+        VendorSubCategory.objects.filter(is_active=True).annotate(
+            active_vendor_count=Count('vendor_profiles', filter=Q(vendor_profiles__is_active=True))
+        ),
+        ids
+    )
+    return {str(subcategory.pk): {
+        'type': 'vendor_subcategory',
+        'id': str(subcategory.id),
+        'title': subcategory.name,
+        'subtitle': f"{subcategory.active_vendor_count} vendors available",
+        'description': _truncate(subcategory.description),
+        'image': request.build_absolute_uri(subcategory.banner_image.url) if subcategory.banner_image else None,
+        'url': f'/vendors?subcategory={subcategory.slug}',
+        'category': 'Subcategory',
+        'vendor_count': subcategory.active_vendor_count
+    } for subcategory in subcategories}
+
+
+def hydrate_portfolios(request, ids):
+    first_image = PortfolioImage.objects.filter(
+        portfolio=OuterRef('pk'), is_active=True
+    ).order_by('order', 'id')
+    portfolios = _fetch(
+        Portfolio.objects.filter(is_active=True).select_related('category').annotate(
+            first_image_file=Subquery(first_image.values('image_file')[:1]),
+            first_image_url=Subquery(first_image.values('image_url')[:1]),
+            active_image_count=Count('portfolio_images', filter=Q(portfolio_images__is_active=True)),
+        ),
+        ids
+    )
+    results = {}
+    for portfolio in portfolios:
+        if portfolio.first_image_file:
+            image_url = _media_url(request, PortfolioImage, 'image_file', portfolio.first_image_file)
+        else:
+            image_url = portfolio.first_image_url or None
+
+        results[str(portfolio.pk)] = {
+            'type': 'portfolio',
+            'id': str(portfolio.id),
+            'title': portfolio.title,
+            'subtitle': portfolio.location,
+            'description': _truncate(portfolio.description),
+            'image': image_url,
+            'url': f'/portfolio/{portfolio.id}',
+            'category': portfolio.category.name if portfolio.category else 'Album',
+            'location': portfolio.location,
+            'image_count': portfolio.active_image_count
+        }
+    return results
+
+
+def hydrate_portfolio_categories(request, ids):
+    # Cover of the first active portfolio in the category (default Portfolio ordering)
+    first_portfolio = Portfolio.objects.filter(
+        category=OuterRef('pk'), is_active=True
+    ).order_by('order', '-date')
+    categories = _fetch(
+        PortfolioCategory.objects.filter(is_active=True).annotate(
+            cover_image_file=Subquery(first_portfolio.values('cover_image_file')[:1]),
+            cover_image_url=Subquery(first_portfolio.values('cover_image_url')[:1]),
+            active_portfolio_count=Count('portfolios', filter=Q(portfolios__is_active=True)),
+        ),
+        ids
+    )
+    results = {}
+    for category in categories:
+        if category.cover_image_file:
+            image_url = _media_url(request, Portfolio, 'cover_image_file', category.cover_image_file)
+        else:
+            image_url = category.cover_image_url or None
+
+        results[str(category.pk)] = {
+            'type': 'portfolio_category',
+            'id': str(category.id),
+            'title': category.name,
+            'subtitle': f"{category.active_portfolio_count} albums available",
+            'description': _truncate(category.description),
+            'image': image_url,
+            'url': f'/portfolio?category={category.id}',
+            'category': 'Portfolio Category',
+            'portfolio_count': category.active_portfolio_count
+        }
+    return results
+
+
+def hydrate_portfolio_images(request, ids):
+    images = _fetch(
+        PortfolioImage.objects.filter(
+            is_active=True,
+            portfolio__is_active=True
+        ).select_related('portfolio'),
+        ids
+    )
+    results = {}
+    for image in images:
+        if image.image_file:
+            image_url = request.build_absolute_uri(image.image_file.url)
+        else:
+            image_url = image.image_url or None
+
+        results[str(image.pk)] = {
+            'type': 'portfolio_image',
+            'id': f"{image.portfolio.id}_{image.id}",
+            'title': image.caption or f"Photo from {image.portfolio.title}",
+            'subtitle': image.portfolio.title,
+            'description': f"From {image.portfolio.title} album in {image.portfolio.location}",
+            'image': image_url,
+            'url': f'/portfolio/{image.portfolio.id}',
+            'category': 'Photo',
+            'location': image.portfolio.location,
+            'portfolio_title': image.portfolio.title
+        }
+    return results
+
+
+def hydrate_vendor_images(request, ids):
+    images = _fetch(
+        VendorImage.objects.filter(
+            is_active=True,
+            vendor__is_active=True
+        ).select_related('vendor'),
+        ids
+    )
+    return {str(image.pk): {
+        'type': 'vendor_image',
+        'id': f"{image.vendor.id}_{image.id}",
+        'title': image.alt_text or f"Photo from {image.vendor.name}",
+        'subtitle': image.vendor.name,
+        'description': f"From {image.vendor.name} in {image.vendor.location}",
+        'image': request.build_absolute_uri(image.image.url) if image.image else None,
+        'url': f'/vendor/{image.vendor.slug}',
+        'category': 'Vendor Photo',
+        'location': image.vendor.location,
+        'rating': image.vendor.rating,
+        'vendor_type': image.vendor.type
+    } for image in images}
+
+
+def hydrate_vendor_services(request, ids):
+    services = _fetch(
+        VendorService.objects.filter(
+            is_active=True,
+            vendor__is_active=True
+        ).select_related('vendor').annotate(
+            first_image=_first_vendor_image(OuterRef('vendor_id'))
+        ),
+        ids
+    )
+    return {str(service.pk): {
+        'type': 'vendor_service',
+        'id': f"{service.vendor.id}_{service.id}",
+        'title': service.name,
+        'subtitle': f"by {service.vendor.name}",
+        'description': _truncate(service.description) if service.description else f"Service offered by {service.vendor.name}",
+        'image': _media_url(request, VendorImage, 'image', service.first_image),
+        'url': f'/vendor/{service.vendor.slug}',
+        'category': 'Service',
+        'location': service.vendor.location,
+        'rating': service.vendor.rating,
+        'vendor_name': service.vendor.name,
+        'vendor_type': service.vendor.type
+    } for service in services}
+
+
+def hydrate_photoshoot_services(request, ids):
+    services = _fetch(PhotoshootService.objects.filter(is_active=True), ids)
+    return {str(service.pk): {
+        'type': 'photoshoot_service',
+        'id': str(service.id),
+        'title': service.title,
+        'subtitle': service.price,
+        'description': _truncate(service.description),
+        'image': request.build_absolute_uri(service.service_image.url) if service.service_image else None,
+        'url': '/photoshoot',
+        'category': 'Photography Service',
+        'price': service.price,
+        'duration': service.duration,
+        'deliverables': service.deliverables,
+        'is_featured': service.is_featured
+    } for service in services}
+
+
+# entity_type -> hydrator
+HYDRATORS = {
+    'vendor': hydrate_vendors,
+    'vendor_category': hydrate_vendor_categories,
+    'vendor_subcategory': hydrate_vendor_subcategories,
+    'portfolio': hydrate_portfolios,
+    'portfolio_category': hydrate_portfolio_categories,
+    'portfolio_image': hydrate_portfolio_images,
+    'vendor_image': hydrate_vendor_images,
+    'vendor_service': hydrate_vendor_services,
+    'photoshoot_service': hydrate_photoshoot_services,
+}
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.SEARCH_FANOUT_WORKERS,
+                    thread_name_prefix='search-hydrate'
+                )
+    return _executor
+
+
+def _hydrate_in_thread(hydrator, request, ids):
+    # Pool threads get their own connection; close it so none is left dangling
+    try:
+        return hydrator(request, ids)
+    finally:
+        connection.close()
+
+
+def _hydrate_all(request, ids_by_type):
+    """
+    Run the hydrators for every type present
+    Returns ({entity_type: {object_id: result}}, [types that missed the deadline])
+    """
+    if settings.SEARCH_FANOUT_WORKERS <= 0 or len(ids_by_type) < 2:
+        return {
+            entity_type: HYDRATORS[entity_type](request, ids)
+            for entity_type, ids in ids_by_type.items()
+        }, []
+
+    started = time.monotonic()
+    executor = _get_executor()
+    futures = {
+        executor.submit(_hydrate_in_thread, HYDRATORS[entity_type], request, ids): entity_type
+        for entity_type, ids in ids_by_type.items()
+    }
+    done, pending = wait(futures, timeout=settings.SEARCH_DEADLINE_MS / 1000)
+
+    hydrated = {futures[future]: future.result() for future in done}
+    timed_out_types = sorted(futures[future] for future in pending)
+    for future in pending:
+        future.cancel()
+    if timed_out_types:
+        logger.warning(
+            f"⚠️ Search hydration deadline ({settings.SEARCH_DEADLINE_MS}ms) missed by "
+            f"{', '.join(timed_out_types)} after {(time.monotonic() - started) * 1000:.0f}ms"
+        )
+    return hydrated, timed_out_types
+
+
+def hydrate_results(request, hits):
+    """
+    Build the result list for ranked [(entity_type, object_id, score), ...]
+    Issues at most one query per entity type present and keeps the hit order.
+    Returns (results, timed_out_types)
+    """
+    ids_by_type = {}
+    for entity_type, object_id, _ in hits:
+        if entity_type in HYDRATORS:
+            ids_by_type.setdefault(entity_type, []).append(object_id)
+
+    hydrated, timed_out_types = _hydrate_all(request, ids_by_type)
+
+    results = []
+    for entity_type, object_id, score in hits:
+        result = hydrated.get(entity_type, {}).get(object_id)
+        if result is not None:
+            results.append({**result, 'score': round(score, 4)})
+    return results, timed_out_types
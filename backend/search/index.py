@@ -0,0 +1,334 @@
+"""
+Full-text index behind global search
+Every searchable entity is stored as one SearchDocument row, which SQLite
+mirrors into the FTS5 table `search_index` so a search is a single MATCH query.
+Hits of all entity types are scored together with BM25 and per-field weights.
+"""
+import logging
+import re
+
+from django.db import connection, transaction
+from django.db.models import Q
+
+from vendor.models import (
+    VendorProfile, VendorCategory, VendorSubCategory, VendorImage, VendorService
+)
+from portfolio.models import Portfolio, Category as PortfolioCategory, PortfolioImage
+from photoshootpage.models import PhotoshootService
+from .models import SearchDocument
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = 'search_index'
+
+# BM25 weight per indexed column - a name match outranks a description match,
+# which outranks a match in a long story
+FIELD_WEIGHTS = {
+    'title': 10.0,
+    'keywords': 5.0,
+    'description': 2.0,
+    'body': 1.0,
+}
+
+# Multiplier per entity type so short documents (photos, services) that only
+# repeat a vendor's name don't crowd the vendor itself out of the first page
+TYPE_WEIGHTS = {
+    'vendor': 1.0,
+    'vendor_category': 1.2,
+    'vendor_subcategory': 1.2,
+    'portfolio': 1.0,
+    'portfolio_category': 1.2,
+    'portfolio_image': 0.6,
+    'vendor_image': 0.5,
+    'vendor_service': 0.8,
+    'photoshoot_service': 1.0,
+}
+
+# Upper bound on ranked hits kept for one query
+MAX_RANKED_HITS = 500
+
+TOKEN_RE = re.compile(r'[^\W_]+')
+
+
+def _join(*parts):
+    return ' '.join(part for part in parts if part)
+
+
+# Document builders - one per entity type
+
+def _vendor_document(vendor):
+    return {
+        'title': vendor.name,
+        'keywords': _join(
+            vendor.tagline, vendor.location, vendor.type,
+            vendor.category.name, vendor.subcategory.name
+        ),
+        'description': vendor.description,
+        'body': vendor.story,
+    }
+
+
+def _category_document(category):
+    return {'title': category.name, 'keywords': '', 'description': category.description, 'body': ''}
+
+
+def _portfolio_document(portfolio):
+    return {
+        'title': portfolio.title,
+        'keywords': _join(portfolio.location, portfolio.category.name),
+        'description': portfolio.description,
+        'body': '',
+    }
+
+
+def _portfolio_image_document(image):
+    return {
+        'title': image.caption,
+        'keywords': _join(image.portfolio.title, image.portfolio.location),
+        'description': '',
+        'body': '',
+    }
+
+
+def _vendor_image_document(image):
+    return {
+        'title': image.alt_text or '',
+        'keywords': _join(image.vendor.name, image.vendor.location),
+        'description': '',
+        'body': '',
+    }
+
+
+def _vendor_service_document(service):
+    return {
+        'title': service.name,
+        'keywords': _join(service.vendor.name, service.vendor.location),
+        'description': service.description or '',
+        'body': '',
+    }
+
+
+def _photoshoot_service_document(service):
+    return {
+        'title': service.title,
+        'keywords': _join(service.price, service.deliverables),
+        'description': service.description,
+        'body': '',
+    }
+
+
+# entity_type -> model, indexable rows, per-object visibility check and document builder
+ENTITIES = {
+    'vendor': {
+        'model': VendorProfile,
+        'queryset': lambda: VendorProfile.objects.filter(is_active=True).select_related('category', 'subcategory'),
+        'is_indexable': lambda vendor: vendor.is_active,
+        'document': _vendor_document,
+    },
+    'vendor_category': {
+        'model': VendorCategory,
+        'queryset': lambda: VendorCategory.objects.filter(is_active=True),
+        'is_indexable': lambda category: category.is_active,
+        'document': _category_document,
+    },
+    'vendor_subcategory': {
+        'model': VendorSubCategory,
+        'queryset': lambda: VendorSubCategory.objects.filter(is_active=True),
+        'is_indexable': lambda subcategory: subcategory.is_active,
+        'document': _category_document,
+    },
+    'portfolio': {
+        'model': Portfolio,
+        'queryset': lambda: Portfolio.objects.filter(is_active=True).select_related('category'),
+        'is_indexable': lambda portfolio: portfolio.is_active,
+        'document': _portfolio_document,
+    },
+    'portfolio_category': {
+        'model': PortfolioCategory,
+        'queryset': lambda: PortfolioCategory.objects.filter(is_active=True),
+        'is_indexable': lambda category: category.is_active,
+        'document': _category_document,
+    },
+    'portfolio_image': {
+        'model': PortfolioImage,
+        'queryset': lambda: PortfolioImage.objects.filter(
+            is_active=True, portfolio__is_active=True
+        ).select_related('portfolio'),
+        'is_indexable': lambda image: image.is_active and image.portfolio.is_active,
+        'document': _portfolio_image_document,
+    },
+    'vendor_image': {
+        'model': VendorImage,
+        'queryset': lambda: VendorImage.objects.filter(
+            is_active=True, vendor__is_active=True
+        ).select_related('vendor'),
+        'is_indexable': lambda image: image.is_active and image.vendor.is_active,
+        'document': _vendor_image_document,
+    },
+    'vendor_service': {
+        'model': VendorService,
+        'queryset': lambda: VendorService.objects.filter(
+            is_active=True, vendor__is_active=True
+        ).select_related('vendor'),
+        'is_indexable': lambda service: service.is_active and service.vendor.is_active,
+        'document': _vendor_service_document,
+    },
+    'photoshoot_service': {
+        'model': PhotoshootService,
+        'queryset': lambda: PhotoshootService.objects.filter(is_active=True),
+        'is_indexable': lambda service: service.is_active,
+        'document': _photoshoot_service_document,
+    },
+}
+
+MODEL_ENTITY_TYPES = {entity['model']: entity_type for entity_type, entity in ENTITIES.items()}
+
+# Objects whose documents embed fields of a parent and must be rebuilt with it
+DEPENDENTS = {
+    VendorProfile: [lambda vendor: vendor.images.all(), lambda vendor: vendor.services.all()],
+    VendorCategory: [lambda category: category.vendor_profiles.select_related('subcategory')],
+    VendorSubCategory: [lambda subcategory: subcategory.vendor_profiles.select_related('category')],
+    Portfolio: [lambda portfolio: portfolio.portfolio_images.all()],
+    PortfolioCategory: [lambda category: category.portfolios.all()],
+}
+
+
+def index_object(instance, cascade=True):
+    """Create, refresh or drop the search document for a single object"""
+    entity_type = MODEL_ENTITY_TYPES.get(type(instance))
+    if entity_type is None:
+        return
+
+    entity = ENTITIES[entity_type]
+    if entity['is_indexable'](instance):
+        SearchDocument.objects.update_or_create(
+            entity_type=entity_type,
+            object_id=str(instance.pk),
+            defaults=entity['document'](instance)
+        )
+    else:
+        SearchDocument.objects.filter(entity_type=entity_type, object_id=str(instance.pk)).delete()
+
+    if cascade:
+        for related in DEPENDENTS.get(type(instance), []):
+            for child in related(instance):
+                index_object(child, cascade=False)
+
+
+def unindex_object(instance):
+    """Remove the search document for a deleted object"""
+    entity_type = MODEL_ENTITY_TYPES.get(type(instance))
+    if entity_type is None:
+        return
+    SearchDocument.objects.filter(entity_type=entity_type, object_id=str(instance.pk)).delete()
+
+
+def rebuild_index():
+    """
+    Rebuild every search document from scratch
+    Returns a dict of entity_type -> number of documents indexed
+    """
+    counts = {}
+    with transaction.atomic():
+        SearchDocument.objects.all().delete()
+        for entity_type, entity in ENTITIES.items():
+            documents = [
+                SearchDocument(entity_type=entity_type, object_id=str(obj.pk), **entity['document'](obj))
+                for obj in entity['queryset']()
+            ]
+            SearchDocument.objects.bulk_create(documents, batch_size=500)
+            counts[entity_type] = len(documents)
+
+        if fts_available():
+            with connection.cursor() as cursor:
+                cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    return counts
+
+
+_fts_available = None
+
+
+def fts_available():
+    """True when the FTS5 table exists (SQLite builds with FTS5 enabled)"""
+    global _fts_available
+    if _fts_available is None:
+        _fts_available = (
+            connection.vendor == 'sqlite'
+            and FTS_TABLE in connection.introspection.table_names()
+        )
+    return _fts_available
+
+
+def tokenize(query):
+    """Split a user query into lowercase word tokens"""
+    return TOKEN_RE.findall(query.lower())
+
+
+def build_match_expression(tokens):
+    """Every token must match, each as a word prefix ("wed" finds "wedding")"""
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def rank(query):
+    """
+    Score every document matching the query
+    Returns [(entity_type, object_id, score), ...] best first, higher score is better
+    """
+    tokens = tokenize(query)
+    if not tokens:
+        return []
+
+    if fts_available():
+        hits = _rank_fts(tokens)
+    else:
+        hits = _rank_documents(tokens)
+
+    ranked = [
+        (entity_type, object_id, score * TYPE_WEIGHTS.get(entity_type, 1.0))
+        for entity_type, object_id, score in hits
+    ]
+    ranked.sort(key=lambda hit: -hit[2])
+    return ranked[:MAX_RANKED_HITS]
+
+
+def _rank_fts(tokens):
+    # bm25() takes one weight per column, including the two UNINDEXED ones;
+    # it returns lower-is-better values, so negate it
+    weights = ', '.join(['0', '0'] + [str(weight) for weight in FIELD_WEIGHTS.values()])
+    sql = f"""
+        SELECT entity_type, object_id, -bm25({FTS_TABLE}, {weights}) AS score
+        FROM {FTS_TABLE}
+        WHERE {FTS_TABLE} MATCH %s
+        ORDER BY score DESC
+        LIMIT %s
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [build_match_expression(tokens), MAX_RANKED_HITS])
+        return cursor.fetchall()
+
+
+def _rank_documents(tokens):
+    """
+    Fallback for databases without FTS5 - one scan over the document table,
+    scored by weighted token occurrences per field
+    """
+    documents = SearchDocument.objects.all()
+    for token in tokens:
+        documents = documents.filter(
+            Q(title__icontains=token) |
+            Q(keywords__icontains=token) |
+            Q(description__icontains=token) |
+            Q(body__icontains=token)
+        )
+
+    hits = []
+    fields = list(FIELD_WEIGHTS)
+    for row in documents.values_list('entity_type', 'object_id', *fields):
+        texts = [(text or '').lower() for text in row[2:]]
+        score = sum(
+            weight * text.count(token)
+            for weight, text in zip(FIELD_WEIGHTS.values(), texts)
+            for token in tokens
+        )
+        hits.append((row[0], row[1], float(score)))
+    return hits
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from search.index import rebuild_index, fts_available
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the global search index from vendors, portfolios, categories and services'
+
+    def handle(self, *args, **options):
+        self.stdout.write('Rebuilding search index...')
+
+        counts = rebuild_index()
+        for entity_type, count in counts.items():
+            self.stdout.write(f'  {entity_type}: {count} documents')
+
+        if not fts_available():
+            self.stdout.write(self.style.WARNING(
+                'FTS5 table not found - search will scan the document table instead'
+            ))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Successfully indexed {sum(counts.values())} documents!'
+        ))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from search.models import SearchSuggestion
+from search.suggestions import rebuild_suggestions
+
+
+class Command(BaseCommand):
+    help = 'Recount the materialized terms served by the search suggestions endpoint'
+
+    def handle(self, *args, **options):
+        self.stdout.write('Rebuilding search suggestions...')
+
+        total = rebuild_suggestions()
+        for suggestion in SearchSuggestion.objects.all():
+            self.stdout.write(f'  {suggestion.term}: {suggestion.count}')
+
+        self.stdout.write(self.style.SUCCESS(f'Successfully rebuilt {total} suggestions!'))
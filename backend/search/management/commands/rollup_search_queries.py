@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from search import analytics
+from search.models import SearchTermStat
+
+
+class Command(BaseCommand):
+    help = 'Aggregate the search query log into per-term stats (run periodically, e.g. hourly from cron)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=analytics.ROLLUP_DAYS,
+            help='Window of log entries to aggregate'
+        )
+        parser.add_argument(
+            '--prune-days',
+            type=int,
+            default=None,
+            help='Also delete log entries older than this many days'
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'Rolling up search queries from the last {options["days"]} days...')
+
+        total = analytics.rollup(options['days'])
+        for stat in SearchTermStat.objects.all()[:10]:
+            self.stdout.write(f'  {stat.term}: {stat.searches} searches, {stat.zero_result_searches} without results')
+
+        if options['prune_days'] is not None:
+            deleted = analytics.prune(options['prune_days'])
+            self.stdout.write(f'Pruned {deleted} log entries older than {options["prune_days"]} days')
+
+        self.stdout.write(self.style.SUCCESS(f'Successfully rolled up {total} search terms!'))
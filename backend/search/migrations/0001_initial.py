@@ -0,0 +1,92 @@
+# Generated by Django 5.2.6 on 2026-10-18 12:09
+
+from django.db import migrations, models
+
+
+FTS_SQL = [
+    """
+    CREATE VIRTUAL TABLE search_index USING fts5(
+        entity_type UNINDEXED,
+        object_id UNINDEXED,
+        title,
+        keywords,
+        description,
+        body,
+        content='search_searchdocument',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER search_searchdocument_ai AFTER INSERT ON search_searchdocument BEGIN
+        INSERT INTO search_index(rowid, entity_type, object_id, title, keywords, description, body)
+        VALUES (new.id, new.entity_type, new.object_id, new.title, new.keywords, new.description, new.body);
+    END
+    """,
+    """
+    CREATE TRIGGER search_searchdocument_ad AFTER DELETE ON search_searchdocument BEGIN
+        INSERT INTO search_index(search_index, rowid, entity_type, object_id, title, keywords, description, body)
+        VALUES ('delete', old.id, old.entity_type, old.object_id, old.title, old.keywords, old.description, old.body);
+    END
+    """,
+    """
+    CREATE TRIGGER search_searchdocument_au AFTER UPDATE ON search_searchdocument BEGIN
+        INSERT INTO search_index(search_index, rowid, entity_type, object_id, title, keywords, description, body)
+        VALUES ('delete', old.id, old.entity_type, old.object_id, old.title, old.keywords, old.description, old.body);
+        INSERT INTO search_index(rowid, entity_type, object_id, title, keywords, description, body)
+        VALUES (new.id, new.entity_type, new.object_id, new.title, new.keywords, new.description, new.body);
+    END
+    """,
+]
+
+DROP_FTS_SQL = [
+    "DROP TRIGGER IF EXISTS search_searchdocument_ai",
+    "DROP TRIGGER IF EXISTS search_searchdocument_ad",
+    "DROP TRIGGER IF EXISTS search_searchdocument_au",
+    "DROP TABLE IF EXISTS search_index",
+]
+
+
+def create_fts_index(apps, schema_editor):
+    """FTS5 is SQLite-only; other databases fall back to scanning SearchDocument"""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in FTS_SQL:
+        schema_editor.execute(sql)
+
+
+def drop_fts_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in DROP_FTS_SQL:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entity_type', models.CharField(help_text="Result type returned by global search (e.g., 'vendor', 'portfolio')", max_length=50)),
+                ('object_id', models.CharField(help_text='Primary key of the indexed object', max_length=100)),
+                ('title', models.CharField(blank=True, max_length=300)),
+                ('keywords', models.TextField(blank=True, help_text='Locations, types and parent names')),
+                ('description', models.TextField(blank=True)),
+                ('body', models.TextField(blank=True, help_text='Long-form text such as vendor stories')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Search Document',
+                'verbose_name_plural': 'Search Documents',
+                'unique_together': {('entity_type', 'object_id')},
+            },
+        ),
+        migrations.RunPython(create_fts_index, drop_fts_index),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.6 on 2026-10-18 12:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchSuggestion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=100, unique=True)),
+                ('type', models.CharField(help_text="Result type the term points at (e.g., 'vendor_category')", max_length=50)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('position', models.PositiveIntegerField(default=0, help_text='Display order (lower numbers first)')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Search Suggestion',
+                'verbose_name_plural': 'Search Suggestions',
+                'ordering': ['position'],
+                'indexes': [models.Index(fields=['count', 'position'], name='search_sugg_count_pos_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.6 on 2026-10-18 12:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0002_searchsuggestion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchQueryLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('query', models.CharField(db_index=True, help_text='Normalized query (case-folded, accents stripped)', max_length=200)),
+                ('result_count', models.PositiveIntegerField(default=0, help_text='Total matches for the query')),
+                ('latency_ms', models.PositiveIntegerField(default=0, help_text='Time spent serving the request')),
+                ('type_hits', models.JSONField(blank=True, default=dict, help_text='Matches per result type')),
+                ('fuzzy', models.BooleanField(default=False, help_text='Served by the typo-tolerant fallback')),
+                ('created_at', models.DateTimeField(db_index=True)),
+            ],
+            options={
+                'verbose_name': 'Search Query Log',
+                'verbose_name_plural': 'Search Query Logs',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SearchTermStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=200, unique=True)),
+                ('searches', models.PositiveIntegerField(default=0)),
+                ('zero_result_searches', models.PositiveIntegerField(default=0)),
+                ('last_searched_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Search Term Stat',
+                'verbose_name_plural': 'Search Term Stats',
+                'ordering': ['-searches'],
+                'indexes': [models.Index(fields=['-searches'], name='search_term_searches_idx'), models.Index(fields=['-zero_result_searches'], name='search_term_zero_idx')],
+            },
+        ),
+    ]
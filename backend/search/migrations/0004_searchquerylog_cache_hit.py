@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-18 13:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0003_searchquerylog_searchtermstat'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='searchquerylog',
+            name='cache_hit',
+            field=models.BooleanField(default=False, help_text='Page served from the result cache'),
+        ),
+    ]
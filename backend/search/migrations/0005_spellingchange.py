@@ -0,0 +1,27 @@
+# Generated by Django 5.2.6 on 2026-10-18 13:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0004_searchquerylog_cache_hit'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SpellingChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(db_index=True, help_text="'<app label>.<model>:<pk>' of the object", max_length=150)),
+                ('words', models.JSONField(blank=True, default=list, help_text='Empty once the object is deleted or hidden')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                'verbose_name': 'Spelling Change',
+                'verbose_name_plural': 'Spelling Changes',
+                'ordering': ['id'],
+            },
+        ),
+    ]
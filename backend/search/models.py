@@ -0,0 +1,152 @@
+from django.db import models
+
+
+class SearchDocument(models.Model):
+    """
+    One row per searchable entity (vendor, portfolio, category, service...)
+    Mirrored into the SQLite FTS5 table `search_index` by database triggers
+    """
+    entity_type = models.CharField(
+        max_length=50,
+        help_text="Result type returned by global search (e.g., 'vendor', 'portfolio')"
+    )
+
+    object_id = models.CharField(
+        max_length=100,
+        help_text="Primary key of the indexed object"
+    )
+
+    title = models.CharField(max_length=300, blank=True)
+    keywords = models.TextField(blank=True, help_text="Locations, types and parent names")
+    description = models.TextField(blank=True)
+    body = models.TextField(blank=True, help_text="Long-form text such as vendor stories")
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Search Document"
+        verbose_name_plural = "Search Documents"
+        unique_together = ['entity_type', 'object_id']
+
+    def __str__(self):
+        return f"{self.entity_type}:{self.object_id} - {self.title}"
+
+
+class SearchSuggestion(models.Model):
+    """
+    Materialized suggestion terms with their result counts
+    Maintained by search/suggestions.py so the suggestions endpoint is a single read
+    """
+    term = models.CharField(max_length=100, unique=True)
+
+    type = models.CharField(
+        max_length=50,
+        help_text="Result type the term points at (e.g., 'vendor_category')"
+    )
+
+    count = models.PositiveIntegerField(default=0)
+
+    position = models.PositiveIntegerField(
+        default=0,
+        help_text="Display order (lower numbers first)"
+    )
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Search Suggestion"
+        verbose_name_plural = "Search Suggestions"
+        ordering = ['position']
+        indexes = [
+            models.Index(fields=['count', 'position'], name='search_sugg_count_pos_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.term} ({self.count})"
+
+
+class SearchQueryLog(models.Model):
+    """
+    One row per global search request
+    Buffered in memory and written in bulk by search/analytics.py
+    """
+    query = models.CharField(
+        max_length=200,
+        db_index=True,
+        help_text="Normalized query (case-folded, accents stripped)"
+    )
+
+    result_count = models.PositiveIntegerField(default=0, help_text="Total matches for the query")
+
+    latency_ms = models.PositiveIntegerField(default=0, help_text="Time spent serving the request")
+
+    type_hits = models.JSONField(default=dict, blank=True, help_text="Matches per result type")
+
+    fuzzy = models.BooleanField(default=False, help_text="Served by the typo-tolerant fallback")
+
+    cache_hit = models.BooleanField(default=False, help_text="Page served from the result cache")
+
+    created_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        verbose_name = "Search Query Log"
+        verbose_name_plural = "Search Query Logs"
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.query} ({self.result_count})"
+
+
+class SearchTermStat(models.Model):
+    """
+    Per-term rollup of SearchQueryLog over the recent window
+    Rebuilt by the rollup_search_queries command; feeds popular and
+    zero-result terms into the suggestions endpoint
+    """
+    term = models.CharField(max_length=200, unique=True)
+
+    searches = models.PositiveIntegerField(default=0)
+
+    zero_result_searches = models.PositiveIntegerField(default=0)
+
+    last_searched_at = models.DateTimeField()
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Search Term Stat"
+        verbose_name_plural = "Search Term Stats"
+        ordering = ['-searches']
+        indexes = [
+            models.Index(fields=['-searches'], name='search_term_searches_idx'),
+            models.Index(fields=['-zero_result_searches'], name='search_term_zero_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.term} ({self.searches})"
+
+
+class SpellingChange(models.Model):
+    """
+    Current vocabulary words of one source object, appended whenever it is
+    saved or deleted
+    Workers apply rows newer than the last one they saw, replacing that
+    object's previous words (see search/spelling.py)
+    """
+    source = models.CharField(
+        max_length=150,
+        db_index=True,
+        help_text="'<app label>.<model>:<pk>' of the object"
+    )
+
+    words = models.JSONField(default=list, blank=True, help_text="Empty once the object is deleted or hidden")
+
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        verbose_name = "Spelling Change"
+        verbose_name_plural = "Spelling Changes"
+        ordering = ['id']
+
+    def __str__(self):
+        return f"{self.source} ({len(self.words)} words)"
@@ -0,0 +1,63 @@
+"""
+Result cache for global search
+Results are stored under the normalized query (case-folded, accent-stripped,
+whitespace-collapsed) and the current generation. Saving or deleting any
+searched model bumps the generation, so stale entries are never read again
+and simply expire.
+"""
+import hashlib
+import uuid
+
+from django.core.cache import cache
+
+from .utils import normalize_text
+
+GENERATION_KEY = 'search:results:generation'
+
+RESULT_TIMEOUT = 60 * 60
+
+
+def get_generation():
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, uuid.uuid4().hex, None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def bump_generation():
+    """
+    Invalidate every cached search result
+    The generation is a fresh random token that never expires, not a counter:
+    an expired or evicted counter would restart and reach old keys again.
+    """
+    cache.set(GENERATION_KEY, uuid.uuid4().hex, None)
+
+
+def result_key(query, *parts):
+    """
+    Cache key for a query plus anything else the cached value depends on
+    (request host for absolute media URLs, page cursor, page size)
+    """
+    raw = '|'.join([normalize_text(query)] + [str(part) for part in parts])
+    digest = hashlib.md5(raw.encode('utf-8')).hexdigest()
+    return f'search:results:{get_generation()}:{digest}'
+
+
+def get_results(key):
+    """Cached result page or None"""
+    return cache.get(key)
+
+
+def set_results(key, results):
+    cache.set(key, results, RESULT_TIMEOUT)
+
+
+def get_ranked(query):
+    """Ranked hits for a query, shared by every page of that query"""
+    return cache.get(result_key(query, 'ranked'))
+
+
+def set_ranked(query, hits):
+    cache.set(result_key(query, 'ranked'), hits, RESULT_TIMEOUT)
+
@@ -0,0 +1,65 @@
+"""
+Signal handlers that keep the global search index in sync with content
+"""
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+import logging
+
+from . import autocomplete, fuzzy, index, result_cache, spelling, suggestions
+
+logger = logging.getLogger(__name__)
+
+
+def search_index_save_handler(sender, instance, raw=False, **kwargs):
+    """Refresh the search document of a saved object (and of its dependents)"""
+    if raw:
+        return
+    try:
+        index.index_object(instance)
+    except Exception as e:
+        logger.error(f"❌ Error updating search index for {sender.__name__} {instance.pk}: {str(e)}")
+    content_changed(instance)
+
+
+def search_index_delete_handler(sender, instance, **kwargs):
+    """Drop the search document of a deleted object"""
+    try:
+        index.unindex_object(instance)
+    except Exception as e:
+        logger.error(f"❌ Error removing {sender.__name__} {instance.pk} from search index: {str(e)}")
+    content_changed(instance, deleted=True)
+
+
+def content_changed(instance, deleted=False):
+    """Invalidate the per-process structures and cached results derived from searchable content"""
+    transaction.on_commit(result_cache.bump_generation)
+    if isinstance(instance, autocomplete.SOURCE_MODELS):
+        transaction.on_commit(autocomplete.bump_version)
+    if isinstance(instance, fuzzy.SOURCE_MODELS):
+        transaction.on_commit(fuzzy.bump_version)
+    if isinstance(instance, spelling.SOURCE_MODELS):
+        pk = instance.pk
+        transaction.on_commit(lambda: spelling.record_change(instance, deleted, pk))
+    if isinstance(instance, suggestions.SOURCE_MODELS):
+        try:
+            suggestions.refresh_for(instance)
+        except Exception as e:
+            logger.error(f"❌ Error refreshing search suggestions for {type(instance).__name__}: {str(e)}")
+
+
+def register_search_signals():
+    """
+    Connect post_save/post_delete for every indexed or counted model
+    Call this in apps.py ready() method
+    """
+    for model in set(index.MODEL_ENTITY_TYPES) | set(suggestions.SOURCE_MODELS):
+        post_save.connect(
+            search_index_save_handler,
+            sender=model,
+            dispatch_uid=f'search_index_save_{model._meta.label}'
+        )
+        post_delete.connect(
+            search_index_delete_handler,
+            sender=model,
+            dispatch_uid=f'search_index_delete_{model._meta.label}'
+        )
@@ -0,0 +1,318 @@
+"""
+"Did you mean" corrections for global search
+A SymSpell-style deletion index over the words of vendor, portfolio, service
+and category names: every vocabulary word is stored under each string
+obtainable by deleting up to MAX_EDIT_DISTANCE characters, so correcting a
+token is a few dictionary lookups plus edit-distance checks on the handful of
+candidates - no database access.
+
+Saves and deletes are applied incrementally: each one appends the object's
+current words (none once it is deleted or hidden) to SpellingChange and
+replaces the head token in the shared cache. A worker that sees a new token
+reads the rows after the last one it applied and swaps each object's old
+words for its new ones, so renames drop the old words and re-saves don't
+count an object twice. Row ids come from the database, so concurrent saves
+never share a position in the log.
+"""
+from datetime import timedelta
+from itertools import combinations
+import logging
+import uuid
+
+from django.core.cache import cache
+from django.db.models import Max
+from django.utils import timezone
+
+from vendor.models import VendorProfile, VendorCategory, VendorSubCategory, VendorService
+from portfolio.models import Portfolio, Category as PortfolioCategory
+from photoshootpage.models import PhotoshootService
+from .models import SpellingChange
+from .utils import VersionedIndex, split_words
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = 'search:spelling:version'
+HEAD_KEY = 'search:spelling:head'
+
+# Log rows older than this are deleted; a worker that hasn't synced for that
+# long rebuilds from the database instead
+LOG_RETENTION = timedelta(days=7)
+
+# Rows before the last applied one that are read again, for transactions that
+# took an id first but committed later
+RESYNC_WINDOW = 50
+
+# Text fields whose words make up the vocabulary, per source model
+VOCABULARY_FIELDS = {
+    VendorProfile: ('name', 'tagline', 'location', 'type'),
+    VendorCategory: ('name',),
+    VendorSubCategory: ('name',),
+    VendorService: ('name',),
+    Portfolio: ('title', 'location'),
+    PortfolioCategory: ('name',),
+    PhotoshootService: ('title',),
+}
+
+SOURCE_MODELS = tuple(VOCABULARY_FIELDS)
+
+MAX_EDIT_DISTANCE = 2
+
+# Deletes are only generated for this many leading characters, which keeps the
+# index small; candidates are still verified against the full word
+PREFIX_LENGTH = 7
+
+MIN_WORD_LENGTH = 3
+
+MAX_SUGGESTIONS = 3
+
+
+def _words(values):
+    return [
+        word for value in values
+        for word in split_words(value)
+        if len(word) >= MIN_WORD_LENGTH and not word.isdigit()
+    ]
+
+
+def _deletes(word, max_distance=MAX_EDIT_DISTANCE):
+    """Every string reachable from word by removing up to max_distance characters"""
+    word = word[:PREFIX_LENGTH]
+    deletes = {word}
+    for distance in range(1, min(max_distance, len(word) - 1) + 1):
+        for positions in combinations(range(len(word)), distance):
+            deletes.add(''.join(char for position, char in enumerate(word) if position not in positions))
+    return deletes
+
+
+def edit_distance(source, target, max_distance=MAX_EDIT_DISTANCE):
+    """
+    Optimal string alignment distance (Levenshtein plus adjacent transpositions)
+    Returns max_distance + 1 as soon as the distance is known to exceed max_distance
+    """
+    if abs(len(source) - len(target)) > max_distance:
+        return max_distance + 1
+
+    previous_previous = None
+    previous = list(range(len(target) + 1))
+    for i in range(1, len(source) + 1):
+        current = [i] + [0] * len(target)
+        for j in range(1, len(target) + 1):
+            cost = 0 if source[i - 1] == target[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (i > 1 and j > 1 and source[i - 1] == target[j - 2]
+                    and source[i - 2] == target[j - 1]):
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous_previous, previous = previous, current
+    return previous[-1]
+
+
+class SpellingIndex:
+    """Word frequencies plus the deletion index used to look words up"""
+
+    def __init__(self, words=()):
+        self.frequencies = {}
+        self.deletes = {}
+        self.add_words(words)
+
+    def add_words(self, words):
+        for word in words:
+            if word in self.frequencies:
+                self.frequencies[word] += 1
+                continue
+            self.frequencies[word] = 1
+            for delete in _deletes(word):
+                self.deletes.setdefault(delete, []).append(word)
+
+    def remove_words(self, words):
+        for word in words:
+            count = self.frequencies.get(word, 0)
+            if count > 1:
+                self.frequencies[word] = count - 1
+                continue
+            if not count:
+                continue
+            del self.frequencies[word]
+            for delete in _deletes(word):
+                entries = self.deletes.get(delete)
+                if entries and word in entries:
+                    entries.remove(word)
+                    if not entries:
+                        del self.deletes[delete]
+
+    def candidates(self, token):
+        """[(word, distance), ...] within MAX_EDIT_DISTANCE, closest and most frequent first"""
+        if token in self.frequencies:
+            return [(token, 0)]
+
+        seen, found = set(), []
+        for delete in _deletes(token):
+            for word in self.deletes.get(delete, ()):
+                if word in seen:
+                    continue
+                seen.add(word)
+                distance = edit_distance(token, word)
+                if distance <= MAX_EDIT_DISTANCE:
+                    found.append((word, distance))
+        found.sort(key=lambda item: (item[1], -self.frequencies.get(item[0], 0), item[0]))
+        return found
+
+    def suggest(self, query, limit=MAX_SUGGESTIONS):
+        """
+        Corrected versions of a query, best first; empty when every word is
+        already known or a word has no close match
+        """
+        tokens = split_words(query)
+        if not tokens:
+            return []
+
+        options = []
+        for token in tokens:
+            if len(token) < MIN_WORD_LENGTH or token.isdigit():
+                options.append([token])
+                continue
+            candidates = self.candidates(token)
+            if not candidates:
+                return []
+            options.append([word for word, _ in candidates])
+
+        best = [choices[0] for choices in options]
+        if best == tokens:
+            return []
+
+        # Best correction first, then the runners-up for one word at a time
+        suggestions = [' '.join(best)]
+        for position, choices in enumerate(options):
+            for alternative in choices[1:]:
+                if len(suggestions) >= limit:
+                    return suggestions
+                phrase = ' '.join(best[:position] + [alternative] + best[position + 1:])
+                if phrase not in suggestions:
+                    suggestions.append(phrase)
+        return suggestions
+
+
+def _source(model, pk):
+    return f'{model._meta.label_lower}:{pk}'
+
+
+def _load_sources():
+    """{source: words} of every visible source object"""
+    sources = {}
+    for model, fields in VOCABULARY_FIELDS.items():
+        queryset = model.objects.filter(is_active=True)
+        if model is VendorService:
+            queryset = queryset.filter(vendor__is_active=True)
+        for pk, *values in queryset.values_list('pk', *fields):
+            sources[_source(model, pk)] = _words(values)
+    return sources
+
+
+class IncrementalSpellingIndex(VersionedIndex):
+    """
+    VersionedIndex that also applies the SpellingChange rows other
+    processes added since this worker last looked
+    """
+
+    def __init__(self):
+        super().__init__(VERSION_KEY, self._build)
+        # source -> (id of the change its words came from, words)
+        self.sources = {}
+        self.applied = 0
+        self.head = None
+        self.synced_at = None
+
+    def _build(self):
+        self.head = cache.get(HEAD_KEY)
+        self.applied = SpellingChange.objects.aggregate(last=Max('id'))['last'] or 0
+        sources = _load_sources()
+        index = SpellingIndex()
+        for words in sources.values():
+            index.add_words(words)
+        self.sources = {source: (self.applied, words) for source, words in sources.items()}
+        self.synced_at = timezone.now()
+        logger.info(f"🔎 Spelling index rebuilt with {len(index.frequencies)} words")
+        return index
+
+    def get(self):
+        index = super().get()
+        head = cache.get(HEAD_KEY)
+        if head != self.head:
+            with self.lock:
+                if head != self.head:
+                    index = self._sync(index, head)
+        return index
+
+    def _sync(self, index, head):
+        if timezone.now() - self.synced_at > LOG_RETENTION:
+            # Rows this worker hasn't applied may already be pruned
+            self.index = self._build()
+            return self.index
+
+        changes = SpellingChange.objects.filter(
+            id__gt=self.applied - RESYNC_WINDOW
+        ).order_by('id').values_list('id', 'source', 'words')
+        for change_id, source, words in changes:
+            previous_id, previous_words = self.sources.get(source, (0, []))
+            if change_id <= previous_id:
+                continue
+            index.remove_words(previous_words)
+            index.add_words(words)
+            self.sources[source] = (change_id, words)
+            self.applied = max(self.applied, change_id)
+        self.head = head
+        self.synced_at = timezone.now()
+        return index
+
+
+_index = IncrementalSpellingIndex()
+
+
+def get_index():
+    """This worker's index with every logged change applied"""
+    return _index.get()
+
+
+def bump_version():
+    """Rebuild every worker's vocabulary from the database"""
+    _index.bump()
+
+
+def _visible(instance):
+    if not getattr(instance, 'is_active', True):
+        return False
+    if isinstance(instance, VendorService):
+        return VendorProfile.objects.filter(pk=instance.vendor_id, is_active=True).exists()
+    return True
+
+
+def record_change(instance, deleted=False, pk=None):
+    """
+    Log the current words of a saved or deleted source object
+    Pass the pk taken in post_delete for deletes - delete() clears instance.pk
+    before on_commit callbacks run.
+    """
+    fields = VOCABULARY_FIELDS[type(instance)]
+    visible = not deleted and _visible(instance)
+    changes = [SpellingChange(
+        source=_source(type(instance), instance.pk if pk is None else pk),
+        words=_words(getattr(instance, field) for field in fields) if visible else [],
+    )]
+    if isinstance(instance, VendorProfile) and not deleted:
+        # A vendor's services are only in the vocabulary while the vendor is active
+        for pk, is_active, *values in VendorService.objects.filter(vendor=instance).values_list(
+            'pk', 'is_active', *VOCABULARY_FIELDS[VendorService]
+        ):
+            changes.append(SpellingChange(
+                source=_source(VendorService, pk),
+                words=_words(values) if visible and is_active else [],
+            ))
+
+    SpellingChange.objects.bulk_create(changes)
+    SpellingChange.objects.filter(created_at__lt=timezone.now() - LOG_RETENTION).delete()
+    cache.set(HEAD_KEY, uuid.uuid4().hex, None)
+
+
+def suggest(query):
+    return get_index().suggest(query)
@@ -0,0 +1,88 @@
+"""
+Materialized counts for the search suggestions endpoint
+Each term's count only changes when content changes, so counts are stored in
+SearchSuggestion and refreshed by signals for the models a term depends on.
+"""
+from django.db.models import Q
+
+from vendor.models import VendorProfile, VendorCategory
+from portfolio.models import Portfolio, Category as PortfolioCategory
+from photoshootpage.models import PhotoshootService
+from .models import SearchSuggestion
+
+# term, result type, counted queryset and the models whose changes can move the count
+SUGGESTION_TERMS = [
+    {
+        'term': 'photographers', 'type': 'vendor_category',
+        'queryset': lambda: VendorProfile.objects.filter(category__name__icontains='photo'),
+        'sources': (VendorProfile, VendorCategory),
+    },
+    {
+        'term': 'venues', 'type': 'vendor_category',
+        'queryset': lambda: VendorProfile.objects.filter(category__name__icontains='venue'),
+        'sources': (VendorProfile, VendorCategory),
+    },
+    {
+        'term': 'decorators', 'type': 'vendor_category',
+        'queryset': lambda: VendorProfile.objects.filter(category__name__icontains='decor'),
+        'sources': (VendorProfile, VendorCategory),
+    },
+    {
+        'term': 'wedding', 'type': 'portfolio_category',
+        'queryset': lambda: Portfolio.objects.filter(
+            Q(title__icontains='wedding') | Q(category__name__icontains='wedding')
+        ),
+        'sources': (Portfolio, PortfolioCategory),
+    },
+    {
+        'term': 'pre-wedding', 'type': 'portfolio_category',
+        'queryset': lambda: Portfolio.objects.filter(title__icontains='pre-wedding'),
+        'sources': (Portfolio,),
+    },
+    {
+        'term': 'portrait', 'type': 'portfolio_category',
+        'queryset': lambda: Portfolio.objects.filter(title__icontains='portrait'),
+        'sources': (Portfolio,),
+    },
+    {
+        'term': 'events', 'type': 'vendor_category',
+        'queryset': lambda: VendorProfile.objects.filter(category__name__icontains='event'),
+        'sources': (VendorProfile, VendorCategory),
+    },
+    {
+        'term': 'photoshoot services', 'type': 'photoshoot_service',
+        'queryset': lambda: PhotoshootService.objects.filter(is_active=True),
+        'sources': (PhotoshootService,),
+    },
+]
+
+SOURCE_MODELS = tuple({model for definition in SUGGESTION_TERMS for model in definition['sources']})
+
+
+def _refresh(definitions):
+    for definition in definitions:
+        SearchSuggestion.objects.update_or_create(
+            term=definition['term'],
+            defaults={
+                'type': definition['type'],
+                'count': definition['queryset']().count(),
+                'position': SUGGESTION_TERMS.index(definition),
+            }
+        )
+
+
+def refresh_for(instance):
+    """Recount only the terms that depend on the changed object's model"""
+    _refresh([
+        definition for definition in SUGGESTION_TERMS
+        if isinstance(instance, definition['sources'])
+    ])
+
+
+def rebuild_suggestions():
+    """Recount every term and drop terms that are no longer defined"""
+    SearchSuggestion.objects.exclude(
+        term__in=[definition['term'] for definition in SUGGESTION_TERMS]
+    ).delete()
+    _refresh(SUGGESTION_TERMS)
+    return SearchSuggestion.objects.count()
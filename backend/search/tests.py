@@ -0,0 +1,133 @@
+import datetime
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory, TestCase, override_settings
+
+from portfolio.models import Category, Portfolio, PortfolioImage
+from vendor.models import VendorCategory, VendorImage, VendorProfile, VendorSubCategory
+from . import analytics, spelling
+from .hydration import hydrate_results
+from .models import SearchQueryLog
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class ResultCacheStatsTests(TestCase):
+    """Hits and misses of the result cache are counted through the analytics log"""
+
+    def setUp(self):
+        analytics.flush()
+        SearchQueryLog.objects.all().delete()
+
+    def test_repeated_normalized_query_is_a_hit(self):
+        self.assertEqual(self.client.get('/api/search/', {'q': 'Wedding Photographers'}).status_code, 200)
+        self.assertEqual(self.client.get('/api/search/', {'q': '  wédding   PHOTOGRAPHERS '}).status_code, 200)
+        analytics.flush()
+
+        self.assertEqual(
+            list(SearchQueryLog.objects.order_by('created_at', 'id').values_list('query', 'cache_hit')),
+            [('wedding photographers', False), ('wedding photographers', True)]
+        )
+
+        staff = get_user_model().objects.create_user('staff', password='x', is_staff=True)
+        self.client.force_login(staff)
+        stats = self.client.get('/api/search/cache-stats/').json()
+        self.assertEqual((stats['hits'], stats['misses'], stats['hit_rate']), (1, 1, 0.5))
+
+    def test_stats_are_staff_only(self):
+        self.assertIn(self.client.get('/api/search/cache-stats/').status_code, (401, 403))
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class SpellingIndexTests(TestCase):
+    """Saves update the "did you mean" vocabulary incrementally"""
+
+    def setUp(self):
+        category = VendorCategory.objects.create(name='Photography', slug='photography')
+        subcategory = VendorSubCategory.objects.create(category=category, name='Candid', slug='candid')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.vendor = VendorProfile.objects.create(
+                name='Rajdeep Studio', slug='rajdeep-studio', category=category, subcategory=subcategory,
+            )
+        spelling.bump_version()
+        spelling.get_index()
+
+    def test_renamed_vendor_replaces_its_words(self):
+        self.assertEqual(spelling.suggest('rajdep'), ['rajdeep'])
+
+        with mock.patch.object(spelling, '_load_sources', wraps=spelling._load_sources) as load:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.vendor.name = 'Sunflower Studio'
+                self.vendor.save()
+            self.assertEqual(spelling.suggest('sunflowr'), ['sunflower'])
+            self.assertEqual(spelling.suggest('rajdep'), [])
+            # Applied from the change log, not rebuilt from the source tables
+            load.assert_not_called()
+
+    def test_resave_does_not_count_words_twice(self):
+        for _ in range(3):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.vendor.save()
+        self.assertEqual(spelling.get_index().frequencies['rajdeep'], 1)
+
+    def test_deleted_vendor_loses_its_words(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.vendor.delete()
+        self.assertNotIn('rajdeep', spelling.get_index().frequencies)
+
+
+@override_settings(CACHES=LOCMEM_CACHE, SEARCH_FANOUT_WORKERS=0)
+class HydrationQueryTests(TestCase):
+    """Search hits are hydrated with one query per result type, however many there are"""
+
+    @classmethod
+    def setUpTestData(cls):
+        category = VendorCategory.objects.create(name='Photography', slug='photography')
+        subcategory = VendorSubCategory.objects.create(category=category, name='Candid', slug='candid')
+        portfolio_category = Category.objects.create(id='wedding', name='Weddings')
+        cls.hits = []
+        for number in range(1, 6):
+            vendor = VendorProfile.objects.create(
+                name=f'Studio {number}', slug=f'studio-{number}', category=category, subcategory=subcategory,
+            )
+            # bulk_create skips the image signals, which would open the files
+            VendorImage.objects.bulk_create([
+                VendorImage(vendor=vendor, image=f'vendor_images/{number}-{position}.jpg')
+                for position in (1, 2)
+            ])
+            portfolio = Portfolio.objects.create(
+                id=f'wedding-{number}', title=f'Wedding {number}', subtitle='', category=portfolio_category,
+                cover_image_url=f'https://example.com/{number}.jpg',
+                date=datetime.date(2025, 1, number), location='Kolkata', duration='1 Day', guests='100',
+                description='', story='',
+            )
+            for position in (1, 2, 3):
+                PortfolioImage.objects.create(
+                    portfolio=portfolio, image_url=f'https://example.com/{number}/{position}.jpg',
+                )
+            cls.hits += [('vendor', str(vendor.pk), 2.0), ('portfolio', portfolio.pk, 1.0)]
+        cls.hits.append(('vendor_category', str(category.pk), 0.5))
+
+    def hydrate(self, hits, queries):
+        with self.assertNumQueries(queries):
+            results, timed_out_types = hydrate_results(RequestFactory().get('/'), hits)
+        self.assertEqual(timed_out_types, [])
+        return results
+
+    def test_one_query_per_type(self):
+        results = self.hydrate(self.hits, 3)
+
+        self.assertEqual([(result['type'], result['id']) for result in results], [
+            (entity_type, object_id) for entity_type, object_id, _ in self.hits
+        ])
+        vendor, portfolio = results[0], results[1]
+        self.assertTrue(vendor['image'].endswith('/vendor_images/1-1.jpg'))
+        self.assertEqual((vendor['category'], vendor['subcategory']), ('Photography', 'Candid'))
+        self.assertEqual(portfolio['image'], 'https://example.com/1/1.jpg')
+        self.assertEqual((portfolio['category'], portfolio['image_count']), ('Weddings', 3))
+
+    def test_query_count_does_not_grow_with_hits(self):
+        self.hydrate(self.hits[:2], 2)
+        self.hydrate(self.hits[:10], 2)
@@ -4,4 +4,6 @@ from . import views
 urlpatterns = [
     path('', views.global_search, name='global_search'),
     path('suggestions/', views.search_suggestions, name='search_suggestions'),
+    path('autocomplete/', views.search_autocomplete, name='search_autocomplete'),
+    path('cache-stats/', views.search_cache_stats, name='search_cache_stats'),
 ]
\ No newline at end of file
@@ -0,0 +1,61 @@
+"""
+Text helpers shared by the search indexes
+"""
+import re
+import threading
+import unicodedata
+import uuid
+
+from django.core.cache import cache
+
+WHITESPACE_RE = re.compile(r'\s+')
+WORD_RE = re.compile(r'[^\W_]+')
+
+
+def normalize_text(text):
+    """Case-fold, strip accents and collapse whitespace ("  Café  Décor" -> "cafe decor")"""
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return WHITESPACE_RE.sub(' ', stripped.casefold()).strip()
+
+
+def split_words(text):
+    """Normalized words of a text, punctuation dropped ("Salt Lake, Kolkata." -> salt, lake, kolkata)"""
+    return WORD_RE.findall(normalize_text(text))
+
+
+class VersionedIndex:
+    """
+    Per-process holder for an in-memory index
+    The index is rebuilt on the next get() after any process bumps the
+    version stamp stored in the shared cache
+    """
+
+    def __init__(self, version_key, build):
+        self.version_key = version_key
+        self.build = build
+        self.index = None
+        self.version = None
+        self.lock = threading.Lock()
+
+    def current_version(self):
+        version = cache.get(self.version_key)
+        if version is None:
+            # Cold or evicted cache - publish a stamp so all workers agree on it
+            cache.add(self.version_key, uuid.uuid4().hex, None)
+            version = cache.get(self.version_key)
+        return version
+
+    def get(self):
+        """This worker's index, rebuilt if another process bumped the version"""
+        version = self.current_version()
+        if self.index is None or self.version != version:
+            with self.lock:
+                if self.index is None or self.version != version:
+                    self.index = self.build()
+                    self.version = version
+        return self.index
+
+    def bump(self):
+        """Invalidate every worker's copy (called when a source model changes)"""
+        cache.set(self.version_key, uuid.uuid4().hex, None)
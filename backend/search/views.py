@@ -1,18 +1,74 @@
-from rest_framework.decorators import api_view
+import base64
+from collections import Counter
+import time
+
+from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
-from rest_framework import status
-from django.db.models import Q
-from django.urls import reverse
+from rest_framework import status, permissions
+from django.db.models import F
+
+from . import analytics, autocomplete, fuzzy, index, result_cache, spelling
+from .hydration import hydrate_results
+from .models import SearchSuggestion, SearchTermStat
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 50
+
+# Searches a term needs in the rollup window before it is suggested as popular
+MIN_POPULAR_SEARCHES = 3
+
+
+def _rank(query):
+    """
+    Ranked hits for a query and whether they came from the typo-tolerant
+    trigram fallback (only tried when the exact pass finds nothing)
+    """
+    ranked = result_cache.get_ranked(query)
+    if ranked is None:
+        hits = index.rank(query)
+        is_fuzzy = not hits
+        if is_fuzzy:
+            hits = fuzzy.rank(query)
+        ranked = {'hits': hits, 'fuzzy': is_fuzzy}
+        result_cache.set_ranked(query, ranked)
+    return ranked['hits'], ranked['fuzzy']
+
+
+def _encode_cursor(offset):
+    return base64.urlsafe_b64encode(f'o:{offset}'.encode()).decode()
+
+
+def _decode_cursor(cursor):
+    """Offset into the ranked hit list; raises ValueError for a malformed cursor"""
+    if not cursor:
+        return 0
+    try:
+        prefix, offset = base64.urlsafe_b64decode(cursor.encode()).decode().split(':')
+    except Exception:
+        raise ValueError('Invalid cursor')
+    if prefix != 'o' or not offset.isdigit():
+        raise ValueError('Invalid cursor')
+    return int(offset)
 
-from vendor.models import VendorProfile, VendorCategory, VendorSubCategory
-from portfolio.models import Portfolio, Category as PortfolioCategory, PortfolioImage
-from photoshootpage.models import PhotoshootService
 
 @api_view(['GET'])
 def global_search(request):
     """
     Global search across vendors, portfolios, categories, and services
+    Hits of every type are ranked together (BM25 with per-field weights, see
+    search/index.py) and returned a page at a time: pass `limit` and the
+    `next_cursor` of the previous page as `cursor`. Hydration is one query per
+    type on the page (see search/hydration.py); ranked hits and pages are cached
+    per normalized query (see search/result_cache.py). When nothing matches
+    exactly, a trigram index finds near misses ("banqet", "kolkatta") and the
+    response is flagged with `fuzzy`; `did_you_mean` then lists spelling
+    corrections from the indexed vocabulary (see search/spelling.py). Result
+    types are hydrated concurrently under a deadline; types that miss it are
+    listed in `timed_out_types` and the partial page is not cached. Every
+    search, and whether it was a cache hit, is queued for the analytics log
+    (see search/analytics.py).
     """
+    started = time.perf_counter()
     query = request.GET.get('q', '').strip()
     
     if not query or len(query) < 2:
@@ -21,299 +77,54 @@ def global_search(request):
             'results': []
         }, status=status.HTTP_400_BAD_REQUEST)
     
-    results = []
+    try:
+        limit = min(max(int(request.GET.get('limit', DEFAULT_PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+        offset = _decode_cursor(request.GET.get('cursor'))
+    except ValueError:
+        return Response({
+            'message': 'Invalid limit or cursor',
+            'results': []
+        }, status=status.HTTP_400_BAD_REQUEST)
     
     try:
-        # Search in Vendor Profiles - comprehensive search
-        vendor_profiles = VendorProfile.objects.filter(
-            Q(name__icontains=query) |
-            Q(tagline__icontains=query) |
-            Q(description__icontains=query) |
-            Q(story__icontains=query) |
-            Q(location__icontains=query) |
-            Q(type__icontains=query) |
-            Q(category__name__icontains=query) |
-            Q(subcategory__name__icontains=query),
-            is_active=True
-        ).distinct()[:10]
-        
-        for vendor in vendor_profiles:
-            # Get image URL properly from VendorImage
-            image_url = None
-            first_image = vendor.images.filter(is_active=True).first()
-            if first_image and first_image.image:
-                image_url = request.build_absolute_uri(first_image.image.url)
-            
-            results.append({
-                'type': 'vendor',
-                'id': str(vendor.id),
-                'title': vendor.name,
-                'subtitle': vendor.tagline,
-                'description': vendor.description[:150] + '...' if len(vendor.description) > 150 else vendor.description,
-                'image': image_url,
-                'url': f'/vendor/{vendor.slug}',
-                'category': vendor.category.name if vendor.category else 'Vendor',
-                'subcategory': vendor.subcategory.name if vendor.subcategory else None,
-                'location': vendor.location,
-                'rating': float(vendor.rating) if vendor.rating else None,
-                'price_range': vendor.price_range,
-                'vendor_type': vendor.type
-            })
-        
-        # Search in Vendor Categories
-        vendor_categories = VendorCategory.objects.filter(
-            Q(name__icontains=query) |
-            Q(description__icontains=query),
-            is_active=True
-        ).distinct()[:5]
-        
-        for category in vendor_categories:
-            # Count vendors in this category
-            vendor_count = VendorProfile.objects.filter(category=category, is_active=True).count()
-            
-            # Get image URL properly
-            image_url = None
-            if category.image:
-                image_url = request.build_absolute_uri(category.image.url)
-            
-            results.append({
-                'type': 'vendor_category',
-                'id': str(category.id),
-                'title': category.name,
-                'subtitle': f"{vendor_count} vendors available",
-                'description': category.description[:150] + '...' if len(category.description) > 150 else category.description,
-                'image': image_url,
-                'url': f'/vendors?category={category.slug}',
-                'category': 'Category',
-                'vendor_count': vendor_count
-            })
-        
-        # Search in Vendor Subcategories
-        vendor_subcategories = VendorSubCategory.objects.filter(
-            Q(name__icontains=query) |
-            Q(description__icontains=query),
-            is_active=True
-        ).distinct()[:5]
-        
-        for subcategory in vendor_subcategories:
-            # Count vendors in this subcategory
-            vendor_count = VendorProfile.objects.filter(subcategory=subcategory, is_active=True).count()
-            
-            # Get image URL properly
-            image_url = None
-            if subcategory.banner_image:
-                image_url = request.build_absolute_uri(subcategory.banner_image.url)
-            
-            results.append({
-                'type': 'vendor_subcategory',
-                'id': str(subcategory.id),
-                'title': subcategory.name,
-                'subtitle': f"{vendor_count} vendors available",
-                'description': subcategory.description[:150] + '...' if len(subcategory.description) > 150 else subcategory.description,
-                'image': image_url,
-                'url': f'/vendors?subcategory={subcategory.slug}',
-                'category': 'Subcategory',
-                'vendor_count': vendor_count
-            })
-        
-        # Search in Portfolios
-        portfolios = Portfolio.objects.filter(
-            Q(title__icontains=query) |
-            Q(description__icontains=query) |
-            Q(location__icontains=query) |
-            Q(category__name__icontains=query),
-            is_active=True
-        ).distinct()[:10]
-        
-        for portfolio in portfolios:
-            # Get image URL properly
-            image_url = None
-            first_image = portfolio.images.filter(is_active=True).first()
-            if first_image and first_image.image_file:
-                image_url = request.build_absolute_uri(first_image.image_file.url)
-            elif first_image and first_image.image_url:
-                image_url = first_image.image_url
-            
-            # Count images in portfolio
-            image_count = portfolio.images.filter(is_active=True).count()
-            
-            results.append({
-                'type': 'portfolio',
-                'id': str(portfolio.id),
-                'title': portfolio.title,
-                'subtitle': portfolio.location,
-                'description': portfolio.description[:150] + '...' if len(portfolio.description) > 150 else portfolio.description,
-                'image': image_url,
-                'url': f'/portfolio/{portfolio.id}',
-                'category': portfolio.category.name if portfolio.category else 'Album',
-                'location': portfolio.location,
-                'image_count': image_count
-            })
-        
-        # Search in Portfolio Categories
-        portfolio_categories = PortfolioCategory.objects.filter(
-            Q(name__icontains=query) |
-            Q(description__icontains=query),
-            is_active=True
-        ).distinct()[:5]
-        
-        for category in portfolio_categories:
-            # Count portfolios in this category
-            portfolio_count = Portfolio.objects.filter(category=category, is_active=True).count()
-            
-            # Get image URL properly - Portfolio Category doesn't have image field
-            image_url = None
-            # Use first portfolio's cover image if available
-            first_portfolio = Portfolio.objects.filter(category=category, is_active=True).first()
-            if first_portfolio and first_portfolio.cover_image:
-                # cover_image is a property that returns URL string
-                if first_portfolio.cover_image_file:
-                    image_url = request.build_absolute_uri(first_portfolio.cover_image_file.url)
-                elif first_portfolio.cover_image_url:
-                    image_url = first_portfolio.cover_image_url
-            
-            results.append({
-                'type': 'portfolio_category',
-                'id': str(category.id),
-                'title': category.name,
-                'subtitle': f"{portfolio_count} albums available",
-                'description': category.description[:150] + '...' if len(category.description) > 150 else category.description,
-                'image': image_url,
-                'url': f'/portfolio?category={category.id}',
-                'category': 'Portfolio Category',
-                'portfolio_count': portfolio_count
-            })
-        
-        # Search in Portfolio Images (for individual image search)
-        from portfolio.models import PortfolioImage
-        portfolio_images = PortfolioImage.objects.filter(
-            Q(caption__icontains=query) |
-            Q(portfolio__title__icontains=query) |
-            Q(portfolio__location__icontains=query),
-            is_active=True,
-            portfolio__is_active=True
-        ).select_related('portfolio').distinct()[:5]
-        
-        for image in portfolio_images:
-            # Get image URL properly
-            image_url = None
-            if image.image_file:
-                image_url = request.build_absolute_uri(image.image_file.url)
-            elif image.image_url:
-                image_url = image.image_url
-            
-            results.append({
-                'type': 'portfolio_image',
-                'id': f"{image.portfolio.id}_{image.id}",
-                'title': image.caption or f"Photo from {image.portfolio.title}",
-                'subtitle': image.portfolio.title,
-                'description': f"From {image.portfolio.title} album in {image.portfolio.location}",
-                'image': image_url,
-                'url': f'/portfolio/{image.portfolio.id}',
-                'category': 'Photo',
-                'location': image.portfolio.location,
-                'portfolio_title': image.portfolio.title
-            })
-        
-        # Search in Vendor Images (for individual vendor photos search)
-        from vendor.models import VendorImage
-        vendor_images = VendorImage.objects.filter(
-            Q(title__icontains=query) |
-            Q(vendor__name__icontains=query) |
-            Q(vendor__location__icontains=query),
-            is_active=True,
-            vendor__is_active=True
-        ).select_related('vendor').distinct()[:5]
-        
-        for image in vendor_images:
-            # Get image URL properly
-            image_url = None
-            if image.image:
-                image_url = request.build_absolute_uri(image.image.url)
-            
-            results.append({
-                'type': 'vendor_image',
-                'id': f"{image.vendor.id}_{image.id}",
-                'title': image.title or f"Photo from {image.vendor.name}",
-                'subtitle': image.vendor.name,
-                'description': f"From {image.vendor.name} in {image.vendor.location}",
-                'image': image_url,
-                'url': f'/vendor/{image.vendor.slug}',
-                'category': 'Vendor Photo',
-                'location': image.vendor.location,
-                'rating': image.vendor.rating,
-                'vendor_type': image.vendor.type
-            })
-        
-        # Search in Vendor Services
-        from vendor.models import VendorService
-        vendor_services = VendorService.objects.filter(
-            Q(name__icontains=query) |
-            Q(description__icontains=query) |
-            Q(vendor__name__icontains=query) |
-            Q(vendor__location__icontains=query),
-            is_active=True,
-            vendor__is_active=True
-        ).select_related('vendor').distinct()[:5]
-        
-        for service in vendor_services:
-            # Get vendor image URL properly
-            image_url = None
-            first_vendor_image = service.vendor.images.filter(is_active=True).first()
-            if first_vendor_image and first_vendor_image.image:
-                image_url = request.build_absolute_uri(first_vendor_image.image.url)
-            
-            results.append({
-                'type': 'vendor_service',
-                'id': f"{service.vendor.id}_{service.id}",
-                'title': service.name,
-                'subtitle': f"by {service.vendor.name}",
-                'description': service.description[:150] + '...' if service.description and len(service.description) > 150 else service.description or f"Service offered by {service.vendor.name}",
-                'image': image_url,
-                'url': f'/vendor/{service.vendor.slug}',
-                'category': 'Service',
-                'location': service.vendor.location,
-                'rating': service.vendor.rating,
-                'vendor_name': service.vendor.name,
-                'vendor_type': service.vendor.type
-            })
-        
-        # Search in Photoshoot Services
-        photoshoot_services = PhotoshootService.objects.filter(
-            Q(title__icontains=query) |
-            Q(description__icontains=query) |
-            Q(price__icontains=query) |
-            Q(deliverables__icontains=query),
-            is_active=True
-        ).distinct()[:5]
-        
-        for service in photoshoot_services:
-            # Get image URL properly
-            image_url = None
-            if service.service_image:
-                image_url = request.build_absolute_uri(service.service_image.url)
-            
-            results.append({
-                'type': 'photoshoot_service',
-                'id': str(service.id),
-                'title': service.title,
-                'subtitle': service.price,
-                'description': service.description[:150] + '...' if len(service.description) > 150 else service.description,
-                'image': image_url,
-                'url': '/photoshoot',
-                'category': 'Photography Service',
-                'price': service.price,
-                'duration': service.duration,
-                'deliverables': service.deliverables,
-                'is_featured': service.is_featured
-            })
-        
-        # If no results found, provide suggestions
-        if not results:
+        cache_key = result_cache.result_key(query, request.build_absolute_uri('/'), offset, limit)
+        page = result_cache.get_results(cache_key)
+        cache_hit = page is not None
+        if page is None:
+            hits, is_fuzzy = _rank(query)
+            next_offset = offset + limit
+            results, timed_out_types = hydrate_results(request, hits[offset:next_offset])
+            page = {
+                'results': results,
+                'total_matches': len(hits),
+                'type_totals': dict(Counter(entity_type for entity_type, _, _ in hits)),
+                'next_cursor': _encode_cursor(next_offset) if next_offset < len(hits) else None,
+                'fuzzy': is_fuzzy,
+                'did_you_mean': spelling.suggest(query) if is_fuzzy else [],
+                'timed_out_types': timed_out_types,
+            }
+            # A partial page (a type missed the deadline) is served but not cached
+            if not timed_out_types:
+                result_cache.set_results(cache_key, page)
+        
+        analytics.record(
+            query,
+            page['total_matches'],
+            (time.perf_counter() - started) * 1000,
+            page['type_totals'],
+            page['fuzzy'],
+            cache_hit
+        )
+        
+        # If no results found, offer spelling corrections or general tips
+        if not page['total_matches']:
             return Response({
                 'message': f'No results found for "{query}"',
                 'results': [],
+                'did_you_mean': page['did_you_mean'],
                 'suggestions': [
+                    f'Did you mean "{correction}"?' for correction in page['did_you_mean']
+                ] or [
                     'Try searching for photographers, venues, decorators, or wedding albums',
                     'Use broader terms like "wedding", "photography", or "venue"',
                     'Check spelling and try different keywords'
@@ -321,8 +132,14 @@ def global_search(request):
             })
         
         return Response({
-            'results': results,
-            'total': len(results),
+            'results': page['results'],
+            'total': len(page['results']),
+            'total_matches': page['total_matches'],
+            'type_totals': page['type_totals'],
+            'next_cursor': page['next_cursor'],
+            'fuzzy': page['fuzzy'],
+            'did_you_mean': page['did_you_mean'],
+            'timed_out_types': page['timed_out_types'],
             'query': query
         })
     
@@ -333,32 +150,87 @@ def global_search(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@api_view(['GET'])
+@permission_classes([permissions.IsAdminUser])
+def search_cache_stats(request):
+    """
+    Hit/miss counts of the global search result cache (staff only)
+    Counted from the analytics log (`?days=`, default 1), so searches are
+    never slowed by a counter write; this process's unflushed entries are
+    written first.
+    """
+    try:
+        days = min(max(int(request.GET.get('days', 1)), 1), analytics.ROLLUP_DAYS)
+    except ValueError:
+        return Response({'error': 'Invalid days'}, status=status.HTTP_400_BAD_REQUEST)
+    analytics.flush()
+    return Response({**analytics.cache_stats(days), 'generation': result_cache.get_generation()})
+
+
 @api_view(['GET'])
 def search_suggestions(request):
     """
     Get search suggestions based on popular terms and available data
+    Counts are materialized in SearchSuggestion (see search/suggestions.py);
+    `popular` comes from the query log rollup, and staff also get the terms
+    that most often return nothing (`zero_results`)
     """
     try:
-        suggestions = [
-            {'term': 'photographers', 'type': 'vendor_category', 'count': VendorProfile.objects.filter(category__name__icontains='photo').count()},
-            {'term': 'venues', 'type': 'vendor_category', 'count': VendorProfile.objects.filter(category__name__icontains='venue').count()},
-            {'term': 'decorators', 'type': 'vendor_category', 'count': VendorProfile.objects.filter(category__name__icontains='decor').count()},
-            {'term': 'wedding', 'type': 'portfolio_category', 'count': Portfolio.objects.filter(Q(title__icontains='wedding') | Q(category__name__icontains='wedding')).count()},
-            {'term': 'pre-wedding', 'type': 'portfolio_category', 'count': Portfolio.objects.filter(title__icontains='pre-wedding').count()},
-            {'term': 'portrait', 'type': 'portfolio_category', 'count': Portfolio.objects.filter(title__icontains='portrait').count()},
-            {'term': 'events', 'type': 'vendor_category', 'count': VendorProfile.objects.filter(category__name__icontains='event').count()},
-            {'term': 'photoshoot services', 'type': 'photoshoot_service', 'count': PhotoshootService.objects.filter(is_active=True).count()},
-        ]
-        
-        # Filter out suggestions with 0 results
-        suggestions = [s for s in suggestions if s['count'] > 0]
+        suggestions = list(
+            SearchSuggestion.objects.filter(count__gt=0).values('term', 'type', 'count')
+        )
+        
+        popular = list(
+            SearchTermStat.objects.filter(
+                searches__gte=MIN_POPULAR_SEARCHES,
+                zero_result_searches__lt=F('searches')
+            ).order_by('-searches').values('term', 'searches')[:10]
+        )
+        
+        data = {
+            'suggestions': suggestions,
+            'popular': popular
+        }
+        
+        if request.user.is_staff:
+            data['zero_results'] = list(
+                SearchTermStat.objects.filter(
+                    zero_result_searches__gt=0
+                ).order_by('-zero_result_searches').values('term', 'zero_result_searches')[:20]
+            )
+        
+        return Response(data)
+    
+    except Exception as e:
+        return Response({
+            'error': f'Failed to get suggestions: {str(e)}',
+            'suggestions': []
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['GET'])
+def search_autocomplete(request):
+    """
+    Prefix typeahead over vendor, category, portfolio and service titles
+    Answered from the in-memory index in search/autocomplete.py - no database access
+    """
+    query = request.GET.get('q', '').strip()
+    
+    try:
+        limit = min(max(int(request.GET.get('limit', 8)), 1), 20)
+    except ValueError:
+        limit = 8
+    
+    try:
+        suggestions = autocomplete.get_index().lookup(query, limit) if query else []
         
         return Response({
+            'query': query,
             'suggestions': suggestions
         })
     
     except Exception as e:
         return Response({
-            'error': f'Failed to get suggestions: {str(e)}',
+            'error': f'Autocomplete failed: {str(e)}',
             'suggestions': []
-        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -59,6 +59,8 @@ def run_deployment_commands():
         ("python manage.py check", "Django configuration check"),
         ("python manage.py collectstatic --noinput", "Collecting static files"),
         ("python manage.py migrate", "Running database migrations"),
+        ("python manage.py rebuild_search_index", "Rebuilding search index"),
+        ("python manage.py rebuild_search_suggestions", "Rebuilding search suggestions"),
     ]
     
     for command, description in commands:
@@ -157,6 +159,8 @@ The .env file is already configured for production with:
 ```bash
 python manage.py collectstatic --noinput
 python manage.py migrate
+python manage.py rebuild_search_index
+python manage.py rebuild_search_suggestions
 python manage.py createsuperuser
 ```
 
@@ -0,0 +1,78 @@
+from django.contrib import admin
+from django.urls import reverse
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import mark_safe
+from unfold.admin import ModelAdmin
+from .models import UploadBatch
+
+
+def progress_bar(batch):
+    """Progress bar markup for a batch, refreshed from the status endpoint while it runs"""
+    colour = '#dc2626' if batch.failed else '#16a34a'
+    return format_html(
+        '<div class="upload-batch" data-status-url="{}" data-finished="{}" style="margin: 6px 0;">'
+        '<div style="background: #e5e7eb; border-radius: 4px; height: 8px; width: 240px;">'
+        '<div class="upload-batch-bar" style="background: {}; border-radius: 4px; height: 8px; width: {}%;"></div>'
+        '</div>'
+        '<small class="upload-batch-text">{}: {}/{} images ({} failed) - {}</small>'
+        '</div>',
+        reverse('upload_batch_status', args=[batch.pk]),
+        'true' if batch.finished_at else 'false',
+        colour, batch.percent,
+        batch.created_at.strftime('%d %b %H:%M'), batch.processed, batch.total, batch.failed,
+        batch.get_status_display(),
+    )
+
+
+# Polls the status endpoint of every unfinished batch on the page
+PROGRESS_SCRIPT = '''
+<script>
+(function() {
+  document.querySelectorAll('.upload-batch[data-finished="false"]').forEach(function(el) {
+    const timer = setInterval(function() {
+      fetch(el.dataset.statusUrl, {credentials: 'same-origin'}).then(function(r) { return r.json(); }).then(function(b) {
+        el.querySelector('.upload-batch-bar').style.width = b.percent + '%';
+        el.querySelector('.upload-batch-text').textContent =
+          b.processed + '/' + b.total + ' images (' + b.failed + ' failed) - ' + b.status;
+        if (b.finished_at) { clearInterval(timer); }
+      }).catch(function() { clearInterval(timer); });
+    }, 2000);
+  });
+})();
+</script>
+'''
+
+
+def upload_progress(target, parent_id, limit=5):
+    """Progress of the latest bulk uploads to one portfolio or vendor, for admin readonly fields"""
+    if parent_id is None:
+        return format_html('<p style="color: #666;">No uploads yet</p>')
+    batches = UploadBatch.objects.filter(target=target, parent_id=str(parent_id))[:limit]
+    if not batches:
+        return format_html('<p style="color: #666;">No uploads yet</p>')
+    return format_html(
+        '{}{}',
+        format_html_join('', '{}', ((progress_bar(batch),) for batch in batches)),
+        mark_safe(PROGRESS_SCRIPT),
+    )
+
+
+@admin.register(UploadBatch)
+class UploadBatchAdmin(ModelAdmin):
+    list_display = ['__str__', 'target', 'status', 'progress', 'created_by', 'created_at', 'finished_at']
+    list_filter = ['status', 'target']
+    search_fields = ['label', 'parent_id']
+    readonly_fields = [
+        'target', 'parent_id', 'label', 'status', 'total', 'processed', 'failed',
+        'last_error', 'created_by', 'created_at', 'finished_at', 'progress',
+    ]
+
+    def progress(self, obj):
+        return progress_bar(obj)
+    progress.short_description = 'Progress'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
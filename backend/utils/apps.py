@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+
+
+class UtilsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'utils'
+
+    def ready(self):
+        """Connect the handlers that write responsive image derivatives and store image dimensions"""
+        from .images import register_derivative_signals, register_dimension_signals
+        register_derivative_signals()
+        # Runs after the core app's ready(), so this follows the watermark handler
+        register_dimension_signals()
@@ -0,0 +1,298 @@
+"""
+Responsive image derivatives
+Every uploaded image gets smaller copies at WIDTHS (only those narrower than
+the original) in its own format and as WebP, stored next to a manifest under
+derivatives/<original path>/ (the full file name, so photo.jpg and photo.png
+don't share a directory):
+
+    derivatives/portfolio/x/images/photo.jpg/320.jpg
+    derivatives/portfolio/x/images/photo.jpg/320.webp
+    derivatives/portfolio/x/images/photo.jpg/manifest.json
+
+Derivatives are queued by a post_save handler on every model with an
+ImageField (after the watermark pre_save handler, so copies carry the
+watermark) and written on the upload worker pool (utils/uploads.py) once the
+save commits. The derivatives of a replaced or deleted image are removed the
+same way, unless another row still points at the file. Files uploaded before
+this existed are processed with `python manage.py generate_image_derivatives`.
+
+Models with ImageDimensionsMixin also get their stored width/height/size
+filled in by a pre_save handler, connected after the watermark handler so
+the size is that of the file actually stored.
+
+Serializers expose variants(file, request) next to the original URL:
+    {'width': 1600, 'height': 1067,
+     'srcset': '<320 url> 320w, ..., <original url> 1600w',
+     'webp_srcset': '<320 webp url> 320w, ...',
+     'variants': [{'url', 'width', 'height', 'format'}, ...]}
+"""
+import io
+import json
+import logging
+import time
+
+from PIL import Image, ImageOps
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import models, transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from . import uploads
+from .models import ImageDimensionsMixin
+
+logger = logging.getLogger(__name__)
+
+WIDTHS = (320, 640, 1024, 1600)
+DERIVATIVES_DIR = 'derivatives'
+JPEG_QUALITY = 82
+WEBP_QUALITY = 80
+
+# Logos and icons are shown small, OG images are only read by crawlers
+SKIP_FIELDS = ('logo', 'icon', 'og_image')
+
+# Seconds before an image without derivatives is looked up in storage again
+MISSING_RECHECK = 5 * 60
+
+# Manifests of originals that have derivatives - they never change for a given path
+_manifests = {}
+# Originals found without a manifest -> when that was checked
+_missing = {}
+
+
+def _directory(name):
+    return f'{DERIVATIVES_DIR}/{name}'
+
+
+def manifest_name(name):
+    return f'{_directory(name)}/manifest.json'
+
+
+def generate(name, force=False):
+    """
+    Write the derivatives and manifest of one stored image
+    Returns the manifest, or None when the file can't be read as an image or
+    its derivatives can't be written (logged, never raised).
+    """
+    manifest_path = manifest_name(name)
+    if not force and default_storage.exists(manifest_path):
+        return None
+
+    try:
+        with default_storage.open(name, 'rb') as original:
+            image = ImageOps.exif_transpose(Image.open(original))
+            image.load()
+    except Exception as e:
+        logger.error(f"❌ Error reading image {name} for derivatives: {str(e)}")
+        return None
+
+    try:
+        manifest = _write(name, image)
+    except Exception as e:
+        logger.error(f"❌ Error writing derivatives of {name}: {str(e)}")
+        return None
+    _manifests[name] = manifest
+    _missing.pop(name, None)
+    return manifest
+
+
+def _write(name, image):
+    """Resize, store and list the variants of a loaded image"""
+    manifest_path = manifest_name(name)
+    width, height = image.size
+    has_alpha = image.mode in ('RGBA', 'LA', 'P')
+    base_format = 'png' if has_alpha else 'jpg'
+    manifest = {'width': width, 'height': height, 'variants': []}
+
+    for target in WIDTHS:
+        if target >= width:
+            break
+        resized = image.resize((target, max(1, round(height * target / width))), Image.LANCZOS)
+        for fmt in (base_format, 'webp'):
+            buffer = io.BytesIO()
+            if fmt == 'jpg':
+                resized.convert('RGB').save(buffer, 'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+            elif fmt == 'png':
+                resized.save(buffer, 'PNG', optimize=True)
+            else:
+                resized.save(buffer, 'WEBP', quality=WEBP_QUALITY, method=4)
+            path = f'{_directory(name)}/{target}.{fmt}'
+            if default_storage.exists(path):
+                default_storage.delete(path)
+            default_storage.save(path, ContentFile(buffer.getvalue()))
+            manifest['variants'].append({
+                'name': path, 'width': resized.width, 'height': resized.height, 'format': fmt,
+            })
+
+    if default_storage.exists(manifest_path):
+        default_storage.delete(manifest_path)
+    default_storage.save(manifest_path, ContentFile(json.dumps(manifest).encode('utf-8')))
+    return manifest
+
+
+def remove(name):
+    """Delete the derivatives and manifest of a stored image (logged, never raised)"""
+    _manifests.pop(name, None)
+    _missing.pop(name, None)
+    directory = _directory(name)
+    try:
+        if not default_storage.exists(directory):
+            return
+        _, files = default_storage.listdir(directory)
+        for file_name in files:
+            default_storage.delete(f'{directory}/{file_name}')
+        # Removes the now empty directory on the file system storage
+        default_storage.delete(directory)
+    except Exception as e:
+        logger.error(f"❌ Error removing derivatives of {name}: {str(e)}")
+
+
+def load_manifest(name):
+    """Manifest of a stored image, or None when its derivatives haven't been generated"""
+    if name in _manifests:
+        return _manifests[name]
+    checked = _missing.get(name)
+    if checked is not None and time.monotonic() - checked < MISSING_RECHECK:
+        return None
+    try:
+        with default_storage.open(manifest_name(name), 'rb') as stored:
+            manifest = json.loads(stored.read())
+    except (OSError, ValueError):
+        # Remembered for a while so listings don't hit storage for every image on every request
+        _missing[name] = time.monotonic()
+        return None
+    _manifests[name] = manifest
+    _missing.pop(name, None)
+    return manifest
+
+
+def variants(image, request=None):
+    """srcset/variants structure for an ImageField file (or storage name), None without derivatives"""
+    name = getattr(image, 'name', image)
+    if not name:
+        return None
+    manifest = load_manifest(name)
+    if manifest is None:
+        return None
+
+    def absolute(url):
+        return request.build_absolute_uri(url) if request else url
+
+    original_url = absolute(default_storage.url(name))
+    entries = [
+        {
+            'url': absolute(default_storage.url(variant['name'])),
+            'width': variant['width'],
+            'height': variant['height'],
+            'format': variant['format'],
+        }
+        for variant in manifest['variants']
+    ]
+    base = [entry for entry in entries if entry['format'] != 'webp']
+    webp = [entry for entry in entries if entry['format'] == 'webp']
+    return {
+        'width': manifest['width'],
+        'height': manifest['height'],
+        'srcset': ', '.join(
+            [f"{entry['url']} {entry['width']}w" for entry in base] + [f"{original_url} {manifest['width']}w"]
+        ),
+        'webp_srcset': ', '.join(f"{entry['url']} {entry['width']}w" for entry in webp),
+        'variants': entries,
+    }
+
+
+def image_fields(model):
+    """ImageFields of a model that get derivatives"""
+    return [
+        field for field in model._meta.concrete_fields
+        if isinstance(field, models.ImageField)
+        and not any(skip in field.name.lower() for skip in SKIP_FIELDS)
+    ]
+
+
+def previous_images_handler(sender, instance, raw=False, **kwargs):
+    """Remember the stored image names of a row before the save replaces them"""
+    instance._previous_images = {}
+    if raw or instance._state.adding:
+        return
+    fields = [field.name for field in image_fields(sender)]
+    stored = sender.objects.filter(pk=instance.pk).values_list(*fields).first()
+    if stored:
+        instance._previous_images = dict(zip(fields, stored))
+
+
+def _update(model, new_names, old_images):
+    """Write derivatives of new images and remove those of images no row uses any more"""
+    for name in new_names:
+        generate(name)
+    for field_name, name in old_images:
+        if not model.objects.filter(**{field_name: name}).exists():
+            remove(name)
+
+
+def derivatives_handler(sender, instance, raw=False, **kwargs):
+    """Queue derivatives for images saved without them and cleanup for replaced ones"""
+    if raw:
+        return
+    previous = getattr(instance, '_previous_images', {})
+    new_names, old_images = [], []
+    for field in image_fields(sender):
+        name = getattr(instance, field.name).name or ''
+        if previous.get(field.name) and previous[field.name] != name:
+            old_images.append((field.name, previous[field.name]))
+        if name and load_manifest(name) is None:
+            new_names.append(name)
+    if new_names or old_images:
+        # Never slows down or fails the save - the command can generate them later
+        transaction.on_commit(lambda: uploads.run_in_background(_update, sender, new_names, old_images))
+
+
+def derivatives_delete_handler(sender, instance, **kwargs):
+    """Queue removal of a deleted row's derivatives"""
+    old_images = [
+        (field.name, getattr(instance, field.name).name)
+        for field in image_fields(sender) if getattr(instance, field.name)
+    ]
+    if old_images:
+        transaction.on_commit(lambda: uploads.run_in_background(_update, sender, [], old_images))
+
+
+def register_derivative_signals():
+    """
+    Connect the derivative handlers to every model with an ImageField
+    Call this in apps.py ready() method
+    """
+    from django.apps import apps
+
+    registered = []
+    for model in apps.get_models():
+        if image_fields(model):
+            label = model._meta.label
+            pre_save.connect(previous_images_handler, sender=model, dispatch_uid=f'derivatives_previous_{label}')
+            post_save.connect(derivatives_handler, sender=model, dispatch_uid=f'derivatives_{label}')
+            post_delete.connect(derivatives_delete_handler, sender=model, dispatch_uid=f'derivatives_delete_{label}')
+            registered.append(label)
+    return registered
+
+
+def dimensions_handler(sender, instance, raw=False, **kwargs):
+    """Store the dimensions of new or replaced images"""
+    if raw:
+        return
+    if instance.dimensions_outdated():
+        instance.read_dimensions()
+
+
+def register_dimension_signals():
+    """
+    Connect the dimensions handler to every model with ImageDimensionsMixin
+    Call this in apps.py ready() method - after register_watermark_signals(),
+    which replaces the uploaded file
+    """
+    from django.apps import apps
+
+    registered = []
+    for model in apps.get_models():
+        if issubclass(model, ImageDimensionsMixin):
+            pre_save.connect(dimensions_handler, sender=model, dispatch_uid=f'dimensions_{model._meta.label}')
+            registered.append(model._meta.label)
+    return registered
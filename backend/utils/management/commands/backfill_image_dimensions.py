@@ -0,0 +1,54 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from utils.models import ImageDimensionsMixin
+
+BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = 'Store width, height and file size for images uploaded before they were recorded'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Read every image again, not only those without dimensions'
+        )
+
+    def handle(self, *args, **options):
+        fields = ['image_width', 'image_height', 'image_size']
+        total = 0
+
+        for model in apps.get_models():
+            if not issubclass(model, ImageDimensionsMixin):
+                continue
+
+            rows = model.objects.exclude(**{model.dimensions_field: ''}).exclude(
+                **{f'{model.dimensions_field}__isnull': True}
+            )
+            if not options['force']:
+                rows = rows.filter(image_width__isnull=True)
+            rows = rows.only('pk', model.dimensions_field, *fields)
+
+            updated, failed, batch = 0, 0, []
+            for instance in list(rows):
+                # Header-only read, see ImageDimensionsMixin.read_dimensions()
+                if not instance.read_dimensions():
+                    failed += 1
+                    continue
+                batch.append(instance)
+                if len(batch) >= BATCH_SIZE:
+                    updated += model.objects.bulk_update(batch, fields)
+                    batch = []
+            if batch:
+                updated += model.objects.bulk_update(batch, fields)
+
+            self.stdout.write(f'  {model._meta.label}: {updated} updated, {failed} unreadable')
+            total += updated
+
+            if model._meta.label_lower == 'vendor.vendorimage' and updated:
+                # bulk_update sends no signals, so stored vendor documents still have the old image data
+                from vendor import documents
+                documents.discard()
+
+        self.stdout.write(self.style.SUCCESS(f'Successfully stored dimensions for {total} images!'))
@@ -0,0 +1,49 @@
+from concurrent.futures import ProcessPoolExecutor
+import os
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import connections
+from utils import images
+
+
+class Command(BaseCommand):
+    help = 'Generate responsive derivatives (widths + WebP) for images already in media'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 2,
+            help='Number of worker processes (default: CPU count)'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Regenerate derivatives that already exist'
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('Collecting stored images...')
+        
+        names = set()
+        for model in apps.get_models():
+            for field in images.image_fields(model):
+                names.update(
+                    model.objects.exclude(**{field.name: ''}).exclude(**{f'{field.name}__isnull': True})
+                    .values_list(field.name, flat=True)
+                )
+        names = sorted(names)
+        self.stdout.write(f'Processing {len(names)} images with {options["workers"]} workers...')
+        
+        # Resizing is CPU-bound, so images are spread over processes; the
+        # forked workers must not share the parent's database connections
+        connections.close_all()
+        generated = 0
+        with ProcessPoolExecutor(max_workers=max(1, options['workers'])) as pool:
+            for name, manifest in zip(names, pool.map(images.generate, names, [options['force']] * len(names), chunksize=8)):
+                if manifest is not None:
+                    generated += 1
+                    self.stdout.write(f'  {name}: {len(manifest["variants"])} variants')
+        
+        self.stdout.write(self.style.SUCCESS(f'Successfully generated derivatives for {generated} images!'))
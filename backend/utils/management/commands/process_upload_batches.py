@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from utils import uploads
+
+
+class Command(BaseCommand):
+    help = 'Process staged bulk-upload images left unfinished by a restarted process'
+
+    def handle(self, *args, **options):
+        self.stdout.write('Resuming unfinished upload batches...')
+        
+        # Batches are normally processed in the web process that staged them
+        # (utils/uploads.py); run this after a restart, with no uploads in progress
+        swept = uploads.sweep()
+        if swept:
+            self.stdout.write(f'  Removed {swept} finished or abandoned staging directories')
+        queued = uploads.resume()
+        uploads.wait()
+        
+        self.stdout.write(self.style.SUCCESS(f'Successfully processed {queued} staged image(s)!'))
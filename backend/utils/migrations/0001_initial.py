@@ -0,0 +1,26 @@
+# Generated by Django 5.2.6 on 2026-10-18 12:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderSequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(help_text="Model label, plus ':<parent pk>' for scoped models", max_length=200, unique=True)),
+                ('last_value', models.PositiveIntegerField(default=0, help_text='Highest order value allocated so far')),
+            ],
+            options={
+                'verbose_name': 'Order Sequence',
+                'verbose_name_plural': 'Order Sequences',
+            },
+        ),
+    ]
@@ -1,29 +1,275 @@
 """
 Utility models and mixins for common functionality
 """
-from django.db import models
+import logging
+
+from django.conf import settings
+from django.db import IntegrityError, connection, models, transaction
+
+logger = logging.getLogger(__name__)
+
+
+class OrderSequence(models.Model):
+    """
+    Last order value handed out per model (and per parent for scoped models)
+    Used by AutoOrderMixin.allocate_order()
+    """
+    scope = models.CharField(
+        max_length=200,
+        unique=True,
+        help_text="Model label, plus ':<parent pk>' for scoped models"
+    )
+
+    last_value = models.PositiveIntegerField(
+        default=0,
+        help_text="Highest order value allocated so far"
+    )
+
+    class Meta:
+        verbose_name = "Order Sequence"
+        verbose_name_plural = "Order Sequences"
+
+    def __str__(self):
+        return f"{self.scope}: {self.last_value}"
+
+
+def _advance(scope, count):
+    """Take count values from scope's sequence; returns the new last value, or None if it has no row yet"""
+    # MariaDB reports can_return_columns_from_insert but has no UPDATE ... RETURNING
+    if connection.vendor in ('sqlite', 'postgresql'):
+        # One statement that increments and reads back under the row's write lock
+        table = connection.ops.quote_name(OrderSequence._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'UPDATE {table} SET last_value = last_value + %s WHERE scope = %s RETURNING last_value',
+                [count, scope]
+            )
+            row = cursor.fetchone()
+        return row[0] if row else None
+
+    with transaction.atomic():
+        if OrderSequence.objects.filter(scope=scope).update(last_value=models.F('last_value') + count):
+            return OrderSequence.objects.values_list('last_value', flat=True).get(scope=scope)
+    return None
 
 
 class AutoOrderMixin(models.Model):
     """
     Mixin that provides auto-ordering functionality
     The order field is automatically managed based on creation order
+
+    Values come from an OrderSequence row per model - or per parent when
+    order_scope names a foreign key, so a portfolio's images count 1, 2, 3...
+    on their own. Incrementing that row is atomic, so concurrent uploads
+    never get the same value, and bulk inserts take a whole block at once
+    with assign_order().
     """
     order = models.PositiveIntegerField(
         default=0,
         editable=False,
         help_text="Auto-managed ordering (based on creation time)"
     )
-    
+
+    # Foreign key that order values are counted within (None: the whole table)
+    order_scope = None
+
     class Meta:
         abstract = True
-        
+
     def save(self, *args, **kwargs):
         """Auto-assign order based on creation time"""
         if not self.pk and self.order == 0:
-            # Get the highest order value for this model
-            max_order = self.__class__.objects.aggregate(
-                models.Max('order')
-            )['order__max'] or 0
-            self.order = max_order + 1
-        super().save(*args, **kwargs)
\ No newline at end of file
+            self.order = self.allocate_order(1, self._order_parent())[0]
+        super().save(*args, **kwargs)
+
+    def _order_parent(self):
+        if self.order_scope is None:
+            return None
+        return getattr(self, self._meta.get_field(self.order_scope).attname)
+
+    @classmethod
+    def allocate_order(cls, count=1, parent=None):
+        """Range of count consecutive unused order values (within parent for scoped models)"""
+        parent = getattr(parent, 'pk', parent)
+        scope = cls._meta.label_lower if cls.order_scope is None else f'{cls._meta.label_lower}:{parent}'
+        while True:
+            last = _advance(scope, count)
+            if last is not None:
+                return range(last - count + 1, last + 1)
+
+            # First allocation in this scope - continue after the rows already there
+            rows = cls.objects.all() if cls.order_scope is None else cls.objects.filter(**{cls.order_scope: parent})
+            start = rows.aggregate(models.Max('order'))['order__max'] or 0
+            try:
+                with transaction.atomic():
+                    OrderSequence.objects.create(scope=scope, last_value=start + count)
+                return range(start + 1, start + count + 1)
+            except IntegrityError:
+                # Another writer created the sequence first; take values from it
+                continue
+
+    @classmethod
+    def assign_order(cls, objs):
+        """
+        Give unsaved instances their order values before bulk_create(), one
+        allocation per parent instead of one per row
+        """
+        by_parent = {}
+        for obj in objs:
+            if not obj.pk and obj.order == 0:
+                by_parent.setdefault(obj._order_parent(), []).append(obj)
+        for parent, group in by_parent.items():
+            for obj, value in zip(group, cls.allocate_order(len(group), parent)):
+                obj.order = value
+        return objs
+
+
+class ImageDimensionsMixin(models.Model):
+    """
+    Mixin that stores the width, height and byte size of a model's image
+    The values are read from the image header once, when a new file is
+    saved (pre_save handler in utils/images.py, after watermarking), so
+    serializers can return them without opening the file. Rows saved
+    before this existed are filled by `python manage.py backfill_image_dimensions`.
+    """
+    image_width = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Image width in pixels (read from the file at upload)"
+    )
+
+    image_height = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Image height in pixels (read from the file at upload)"
+    )
+
+    image_size = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Image file size in bytes"
+    )
+
+    # ImageField the dimensions describe
+    dimensions_field = 'image'
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # File name as loaded, so a replaced file can be told apart from an unchanged one
+        instance._loaded_image_name = instance.__dict__.get(cls.dimensions_field)
+        return instance
+
+    def dimensions_outdated(self):
+        """Whether the stored dimensions don't describe the current file"""
+        image = getattr(self, self.dimensions_field)
+        if not image:
+            return self.image_width is not None or self.image_size is not None
+        if self.image_width is None:
+            return True
+        return image.name != getattr(self, '_loaded_image_name', None)
+
+    def read_dimensions(self):
+        """
+        Set the dimension fields from the current file - only the header is
+        parsed, the image isn't decoded. Returns False when the file can't be read.
+        """
+        image = getattr(self, self.dimensions_field)
+        if not image:
+            self.image_width = self.image_height = self.image_size = None
+            return True
+        try:
+            width, height = image.width, image.height
+            size = image.size
+        except Exception as e:
+            logger.error(f"❌ Error reading dimensions of {image.name}: {str(e)}")
+            return False
+        if width is None:
+            logger.error(f"❌ Error reading dimensions of {image.name}: not a readable image")
+            return False
+        self.image_width, self.image_height, self.image_size = width, height, size
+        self._loaded_image_name = image.name
+        return True
+
+    @property
+    def aspect_ratio(self):
+        """Width divided by height, or None before the dimensions are known"""
+        if self.image_width and self.image_height:
+            return round(self.image_width / self.image_height, 4)
+        return None
+
+
+class UploadBatch(models.Model):
+    """
+    Images uploaded together through an admin bulk-upload field
+    The files are staged on disk and turned into model rows by the upload
+    worker pool (utils/uploads.py); the counters below track its progress.
+    """
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('processing', 'Processing'),
+        ('done', 'Done'),
+        ('failed', 'Done with errors'),
+    ]
+
+    target = models.CharField(
+        max_length=100,
+        help_text="Model the images are saved as (e.g., 'portfolio.portfolioimage')"
+    )
+
+    parent_id = models.CharField(
+        max_length=100,
+        help_text="Primary key of the portfolio or vendor the images belong to"
+    )
+
+    label = models.CharField(
+        max_length=200,
+        blank=True,
+        help_text="Name of the portfolio or vendor"
+    )
+
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='queued'
+    )
+
+    total = models.PositiveIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+
+    last_error = models.TextField(
+        blank=True,
+        help_text="Most recent processing error"
+    )
+
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Upload Batch"
+        verbose_name_plural = "Upload Batches"
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.label or self.parent_id}: {self.processed + self.failed}/{self.total} images"
+
+    @property
+    def percent(self):
+        """Share of the batch processed (successfully or not)"""
+        if not self.total:
+            return 100
+        return round((self.processed + self.failed) * 100 / self.total)
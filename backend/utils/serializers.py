@@ -0,0 +1,120 @@
+"""
+Serializer helpers for loading related data up front and for sparse fieldsets
+"""
+
+
+def _split(value):
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+class QueryAwareSerializerMixin:
+    """
+    Serializer that declares the related rows and aggregates it reads
+    select_related_fields, prefetch_lookups (names or Prefetch objects, usually
+    with to_attr) and annotations describe what the serializer needs; views
+    pass their queryset through setup_queryset() so SerializerMethodFields
+    read loaded attributes instead of issuing one query per object.
+
+    Sparse fieldsets: `?fields=name,slug` keeps only the listed fields and
+    `?expand=images,videos` picks which of the expandable_fields (related
+    collections) are included - `?expand=` alone drops all of them. Pruned
+    fields are removed before serialization, their field_prefetches are not
+    run, and with `?fields=` only the columns the remaining fields read (model
+    fields plus field_sources) are selected.
+    """
+    select_related_fields = ()
+    prefetch_lookups = ()
+    annotations = {}
+
+    # Declared (non-model) field -> ORM paths it reads, e.g. ('category__name',)
+    field_sources = {}
+
+    # Field -> prefetch lookups only that field needs
+    field_prefetches = {}
+
+    # Related collections controlled by ?expand=
+    expandable_fields = ()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        selected = self.requested_fields(self.context.get('request'))
+        if selected is not None:
+            for name in set(self.fields) - selected:
+                self.fields.pop(name)
+
+    @classmethod
+    def requested_fields(cls, request):
+        """Field names asked for with ?fields=/?expand=, or None for the full representation"""
+        params = getattr(request, 'query_params', None)
+        if not params or ('fields' not in params and 'expand' not in params):
+            return None
+
+        selected = set(cls.Meta.fields)
+        if params.get('fields'):
+            selected &= _split(params['fields'])
+        if 'expand' in params:
+            expandable = set(cls.expandable_fields)
+            selected = (selected - expandable) | (_split(params['expand']) & expandable)
+        return selected
+
+    @classmethod
+    def _columns(cls, selected):
+        """ORM paths read by the selected fields, or None if any field's sources are unknown"""
+        model = cls.Meta.model
+        columns = set()
+        for name in selected:
+            if name in cls.field_sources:
+                columns.update(cls.field_sources[name])
+            elif name in cls.field_prefetches or name in cls.annotations:
+                continue
+            else:
+                try:
+                    field = model._meta.get_field(name)
+                except Exception:
+                    return None
+                if not field.concrete:
+                    return None
+                columns.add(name)
+        return columns
+
+    @classmethod
+    def setup_queryset(cls, queryset, request=None):
+        """Apply the declared select_related/prefetch_related/annotate/only calls"""
+        selected = cls.requested_fields(request)
+
+        select_related = cls.select_related_fields
+        if selected is not None and request.query_params.get('fields'):
+            columns = cls._columns(selected)
+            if columns is not None:
+                select_related = [
+                    relation for relation in select_related
+                    if any(path == relation or path.startswith(f'{relation}__') for path in columns)
+                ]
+                queryset = queryset.only(queryset.model._meta.pk.name, *columns)
+
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+
+        prefetches = list(cls.prefetch_lookups)
+        for name, lookups in cls.field_prefetches.items():
+            if selected is None or name in selected:
+                prefetches.extend(lookup for lookup in lookups if lookup not in prefetches)
+        if prefetches:
+            queryset = queryset.prefetch_related(*prefetches)
+
+        if cls.annotations:
+            queryset = queryset.annotate(**cls.annotations)
+            # Aggregating querysets ignore Meta.ordering, so keep it explicitly
+            if not queryset.query.order_by:
+                queryset = queryset.order_by(*queryset.model._meta.ordering)
+        return queryset
+
+
+def loaded(obj, attr, fallback):
+    """
+    Value of an annotation or Prefetch to_attr on obj, or fallback() when the
+    object was loaded without setup_queryset()
+    """
+    if attr in obj.__dict__:
+        return obj.__dict__[attr]
+    return fallback()
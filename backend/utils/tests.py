@@ -0,0 +1,290 @@
+import datetime
+import io
+from pathlib import Path
+import shutil
+import tempfile
+from unittest import mock
+
+from PIL import Image
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from homepage.models import HeroSlide
+from portfolio.models import Category, Portfolio, PortfolioImage, love_counter
+from vendor.models import VendorCategory, VendorProfile, VendorSubCategory
+from . import bloom, counters, images, uploads
+from .models import OrderSequence, UploadBatch
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+def jpeg(name, width=1200, height=800):
+    buffer = io.BytesIO()
+    Image.new('RGB', (width, height), (120, 80, 40)).save(buffer, 'JPEG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/jpeg')
+
+
+class TemporaryMediaMixin:
+    """Runs each test against an empty MEDIA_ROOT"""
+
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+
+@override_settings(CACHES=LOCMEM_CACHE, UPLOAD_WORKERS=0)
+class ImageDerivativeTests(TemporaryMediaMixin, TestCase):
+    """Saved images get derivatives, which go away with the image"""
+
+    def setUp(self):
+        super().setUp()
+        category = VendorCategory.objects.create(name='Photography', slug='photography')
+        subcategory = VendorSubCategory.objects.create(category=category, name='Candid', slug='candid')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.vendor = VendorProfile.objects.create(
+                name='Studio', slug='studio', category=category, subcategory=subcategory,
+                profile_image=jpeg('studio.jpg'),
+            )
+
+    def test_saved_image_gets_manifest_and_srcset(self):
+        name = self.vendor.profile_image.name
+        self.assertTrue(default_storage.exists(images.manifest_name(name)))
+        manifest = images.load_manifest(name)
+        self.assertEqual((manifest['width'], manifest['height']), (1200, 800))
+        self.assertEqual(
+            [(variant['width'], variant['format']) for variant in manifest['variants']],
+            [(320, 'jpg'), (320, 'webp'), (640, 'jpg'), (640, 'webp'), (1024, 'jpg'), (1024, 'webp')]
+        )
+
+        listing = self.client.get('/api/vendor/profiles/').json()
+        srcset = listing[0]['main_image_variants']['srcset']
+        self.assertEqual([entry.rsplit(' ', 1)[1] for entry in srcset.split(', ')], ['320w', '640w', '1024w', '1200w'])
+        self.assertIn(f'/media/derivatives/{name}/320.jpg 320w', srcset)
+
+    def test_replaced_image_loses_its_derivatives(self):
+        old_name = self.vendor.profile_image.name
+        with self.captureOnCommitCallbacks(execute=True):
+            self.vendor.profile_image = jpeg('studio-new.jpg')
+            self.vendor.save()
+
+        self.assertFalse(default_storage.exists(images.manifest_name(old_name)))
+        self.assertTrue(default_storage.exists(images.manifest_name(self.vendor.profile_image.name)))
+
+    def test_deleted_row_loses_its_derivatives(self):
+        name = self.vendor.profile_image.name
+        with self.captureOnCommitCallbacks(execute=True):
+            self.vendor.delete()
+
+        self.assertFalse(default_storage.exists(images._directory(name)))
+        self.assertIsNone(images.load_manifest(name))
+
+
+@mock.patch.object(counters, '_ensure_flusher')
+class WriteBehindCounterTests(TestCase):
+    """Love clicks are buffered in memory and written as F() increments"""
+
+    def setUp(self):
+        category = Category.objects.create(id='wedding', name='Weddings')
+        self.portfolios = [
+            Portfolio.objects.create(
+                id=slug, title=slug, subtitle='', category=category,
+                cover_image_url=f'https://example.com/{slug}.jpg',
+                date=datetime.date(2025, 3, 5), location='Kolkata', duration='1 Day', guests='100',
+                description='', story='', love_count=10,
+            )
+            for slug in ('first-wedding', 'second-wedding')
+        ]
+        love_counter.pending.clear()
+
+    def test_increments_are_buffered_until_flushed(self, ensure_flusher):
+        first, second = self.portfolios
+        with self.assertNumQueries(0):
+            for _ in range(3):
+                total = first.increment_love()
+            second.increment_love()
+        self.assertEqual((total, first.current_love_count, second.current_love_count), (13, 13, 11))
+        ensure_flusher.assert_called()
+
+        updated_at = Portfolio.objects.values_list('updated_at', flat=True).get(pk=first.pk)
+        self.assertEqual(love_counter.flush(), 2)
+        self.assertEqual(love_counter.pending, {})
+        self.assertEqual(dict(Portfolio.objects.values_list('pk', 'love_count')), {first.pk: 13, second.pk: 11})
+        # Written with UPDATE ... love_count + n, not save()
+        self.assertEqual(Portfolio.objects.values_list('updated_at', flat=True).get(pk=first.pk), updated_at)
+
+    def test_failed_flush_keeps_the_increments(self, ensure_flusher):
+        first, _ = self.portfolios
+        first.increment_love()
+        with mock.patch.object(Portfolio.objects, 'filter', side_effect=RuntimeError('database is locked')):
+            self.assertEqual(love_counter.flush(), 0)
+        first.increment_love()
+
+        self.assertEqual(love_counter.flush(), 1)
+        self.assertEqual(Portfolio.objects.values_list('love_count', flat=True).get(pk=first.pk), 12)
+
+
+class RotatingBloomFilterTests(SimpleTestCase):
+    """Recently added keys are recognized and forgotten after one to two generations"""
+
+    def test_added_keys_are_seen(self):
+        clicks = bloom.RotatingBloomFilter(capacity=1000, error_rate=0.001)
+        for number in range(500):
+            clicks.add(f'203.0.113.7|portfolio:{number}')
+
+        self.assertTrue(all(clicks.seen(f'203.0.113.7|portfolio:{number}') for number in range(500)))
+        false_positives = sum(clicks.seen(f'198.51.100.9|portfolio:{number}') for number in range(500))
+        self.assertLessEqual(false_positives, 3)
+
+    def test_full_generations_rotate(self):
+        clicks = bloom.RotatingBloomFilter(capacity=10, error_rate=0.001)
+        clicks.add('first')
+        for number in range(10):
+            clicks.add(f'filler-{number}')
+        # Rotated once: 'first' is in the previous generation
+        self.assertTrue(clicks.seen('first'))
+
+        for number in range(10, 20):
+            clicks.add(f'filler-{number}')
+        self.assertFalse(clicks.seen('first'))
+
+    def test_generations_expire_after_the_window(self):
+        with mock.patch.object(bloom.time, 'monotonic', return_value=1000.0) as monotonic:
+            clicks = bloom.RotatingBloomFilter(capacity=100, error_rate=0.001, window=60)
+            clicks.add('first')
+            monotonic.return_value = 1059.0
+            self.assertTrue(clicks.seen('first'))
+            monotonic.return_value = 1061.0
+            self.assertTrue(clicks.seen('first'))
+            monotonic.return_value = 1122.0
+            self.assertFalse(clicks.seen('first'))
+
+
+@mock.patch.object(counters, '_ensure_flusher')
+class LoveClickDedupeTests(TestCase):
+    """A client's repeat love click is rejected before it reaches the counter"""
+
+    def test_repeat_click_is_rejected(self, ensure_flusher):
+        category = Category.objects.create(id='wedding', name='Weddings')
+        portfolio = Portfolio.objects.create(
+            id='dedupe-wedding', title='Dedupe', subtitle='', category=category,
+            cover_image_url='https://example.com/dedupe.jpg',
+            date=datetime.date(2025, 3, 5), location='Kolkata', duration='1 Day', guests='100',
+            description='', story='',
+        )
+        url = f'/api/portfolio/portfolios/{portfolio.pk}/love/'
+
+        first = self.client.post(url, REMOTE_ADDR='203.0.113.7')
+        repeat = self.client.post(url, REMOTE_ADDR='203.0.113.7')
+        other_client = self.client.post(url, REMOTE_ADDR='198.51.100.9')
+
+        # A different user agent from the same address is still a repeat
+        new_agent = self.client.post(url, REMOTE_ADDR='203.0.113.7', HTTP_USER_AGENT='curl/8.5.0')
+
+        self.assertEqual(
+            [response.status_code for response in (first, repeat, other_client, new_agent)],
+            [200, 409, 200, 409]
+        )
+        self.assertEqual(other_client.json()['love_count'], 2)
+        love_counter.pending.clear()
+
+
+class OrderAllocationTests(TestCase):
+    """Order values are handed out per scope without gaps or duplicates"""
+
+    def setUp(self):
+        self.category = Category.objects.create(id='wedding', name='Weddings')
+        self.first, self.second = [
+            Portfolio.objects.create(
+                id=slug, title=slug, subtitle='', category=self.category,
+                cover_image_url=f'https://example.com/{slug}.jpg',
+                date=datetime.date(2025, 3, 5), location='Kolkata', duration='1 Day', guests='100',
+                description='', story='',
+            )
+            for slug in ('first-wedding', 'second-wedding')
+        ]
+
+    def image(self, portfolio, **fields):
+        return PortfolioImage(portfolio=portfolio, image_url=f'https://example.com/{portfolio.pk}.jpg', **fields)
+
+    def orders(self, portfolio):
+        return list(PortfolioImage.objects.filter(portfolio=portfolio).order_by('order').values_list('order', flat=True))
+
+    def test_allocation_per_scope(self):
+        # Rows from before the sequence existed: numbering continues after them
+        PortfolioImage.objects.bulk_create([self.image(self.first, order=number) for number in (1, 2, 3)])
+
+        self.assertEqual(list(PortfolioImage.allocate_order(2, self.first)), [4, 5])
+        self.assertEqual(list(PortfolioImage.allocate_order(3, self.second)), [1, 2, 3])
+        self.assertEqual(list(PortfolioImage.allocate_order(1, self.first.pk)), [6])
+        self.assertEqual(
+            dict(OrderSequence.objects.filter(scope__startswith='portfolio.portfolioimage:').values_list('scope', 'last_value')),
+            {'portfolio.portfolioimage:first-wedding': 6, 'portfolio.portfolioimage:second-wedding': 3}
+        )
+        # Unscoped models count over the whole table
+        self.assertEqual(list(HeroSlide.allocate_order(2)), [1, 2])
+        self.assertEqual(list(HeroSlide.allocate_order(1)), [3])
+
+    def test_saves_and_bulk_creates_have_no_gaps_or_duplicates(self):
+        self.image(self.first).save()
+        PortfolioImage.objects.bulk_create(PortfolioImage.assign_order([
+            self.image(self.first), self.image(self.second), self.image(self.first), self.image(self.second),
+        ]))
+        PortfolioImage.objects.create(portfolio=self.second, image_url='https://example.com/last.jpg')
+
+        self.assertEqual(self.orders(self.first), [1, 2, 3])
+        self.assertEqual(self.orders(self.second), [1, 2, 3])
+
+
+@override_settings(CACHES=LOCMEM_CACHE, UPLOAD_WORKERS=0)
+class UploadBatchTests(TemporaryMediaMixin, TestCase):
+    """Staged bulk uploads become rows and are counted on their batch"""
+
+    def setUp(self):
+        super().setUp()
+        staging_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, staging_dir, ignore_errors=True)
+        patcher = mock.patch.object(uploads, 'STAGING_DIR', staging_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.staging_dir = staging_dir
+
+        category = Category.objects.create(id='wedding', name='Weddings')
+        self.portfolio = Portfolio.objects.create(
+            id='upload-wedding', title='Upload', subtitle='', category=category,
+            cover_image_url='https://example.com/upload.jpg',
+            date=datetime.date(2025, 3, 5), location='Kolkata', duration='1 Day', guests='100',
+            description='', story='',
+        )
+
+    def stage(self, files):
+        with self.captureOnCommitCallbacks(execute=True):
+            batch = uploads.stage('portfolio.portfolioimage', self.portfolio, files)
+            # Nothing is processed before the admin request commits
+            self.assertEqual(UploadBatch.objects.get(pk=batch.pk).status, 'queued')
+            self.assertEqual(len(list((self.staging_dir / str(batch.pk)).iterdir())), len(files))
+        batch.refresh_from_db()
+        return batch
+
+    def test_batch_is_done_once_every_file_is_saved(self):
+        batch = self.stage([jpeg('one.jpg', 400, 300), jpeg('two.jpg', 400, 300)])
+
+        self.assertEqual((batch.status, batch.processed, batch.failed, batch.percent), ('done', 2, 0, 100))
+        self.assertIsNotNone(batch.finished_at)
+        images = PortfolioImage.objects.filter(portfolio=self.portfolio).order_by('order')
+        self.assertEqual([(image.order, image.image_width) for image in images], [(1, 400), (2, 400)])
+        self.assertFalse((self.staging_dir / str(batch.pk)).exists())
+
+    def test_unreadable_file_fails_the_batch(self):
+        broken = SimpleUploadedFile('broken.jpg', b'not an image', content_type='image/jpeg')
+        batch = self.stage([jpeg('one.jpg', 400, 300), broken, jpeg('three.jpg', 400, 300)])
+
+        self.assertEqual((batch.status, batch.processed, batch.failed), ('failed', 2, 1))
+        self.assertTrue(batch.last_error.startswith('broken.jpg: '))
+        self.assertEqual(PortfolioImage.objects.filter(portfolio=self.portfolio).count(), 2)
+        self.assertEqual(uploads.status(batch)['percent'], batch.percent)
+        self.assertFalse((self.staging_dir / str(batch.pk)).exists())
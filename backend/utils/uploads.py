@@ -0,0 +1,267 @@
+"""
+Background processing for admin bulk image uploads
+The admin request only copies the uploaded files into a staging directory
+(UPLOAD_STAGING_DIR/<batch id>/, outside the publicly served MEDIA_ROOT,
+since the files aren't watermarked yet) and records an UploadBatch. Once the
+request's transaction commits, each staged file is handed to a shared
+thread pool of UPLOAD_WORKERS threads, which creates the model row - and so
+runs the watermark pre_save handler - outside the request. Progress is
+counted on the UploadBatch (admin changelist and /admin/uploads/<id>/status/).
+The same pool writes responsive image derivatives (utils/images.py) through
+run_in_background(); with UPLOAD_WORKERS = 0 jobs run inline instead.
+
+The staging directory is the queue: a worker claims a file by renaming it,
+and removes it once its row is saved. Files left behind by a restarted
+process are picked up by `python manage.py process_upload_batches`; when a
+process starts its worker pool it sweeps staging directories of batches that
+are finished, unknown or abandoned for longer than STALE_AFTER.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+import logging
+import os
+from pathlib import Path
+import shutil
+import threading
+
+from PIL import Image
+from django.apps import apps
+from django.conf import settings
+from django.core.files import File
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import UploadBatch
+
+logger = logging.getLogger(__name__)
+
+STAGING_DIR = Path(settings.UPLOAD_STAGING_DIR)
+CLAIMED_SUFFIX = '.claimed'
+
+# Unfinished batches older than this were left by a process that died mid-batch
+STALE_AFTER = timedelta(days=1)
+
+# Model label -> (parent foreign key, image field, extra field values)
+TARGETS = {
+    'portfolio.portfolioimage': ('portfolio', 'image_file', {'is_active': True, 'is_cover': False}),
+    'vendor.vendorimage': ('vendor', 'image', {'is_active': True}),
+}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _pool():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                try:
+                    sweep()
+                except Exception as e:
+                    logger.error(f"❌ Error sweeping upload staging directory: {str(e)}")
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.UPLOAD_WORKERS,
+                    thread_name_prefix='upload'
+                )
+    return _executor
+
+
+def stage(target, parent, files, user=None):
+    """
+    Copy uploaded files to the staging directory and queue them
+    Returns the UploadBatch; processing starts after the current transaction commits.
+    """
+    model = apps.get_model(target)
+    batch = UploadBatch.objects.create(
+        target=target,
+        parent_id=str(parent.pk),
+        label=str(parent),
+        total=len(files),
+        created_by=user if user is not None and user.is_authenticated else None,
+    )
+
+    # Order values are taken now, in upload order, since workers finish in any order
+    if hasattr(model, 'allocate_order'):
+        orders = model.allocate_order(len(files), parent)
+    else:
+        orders = [0] * len(files)
+
+    directory = STAGING_DIR / str(batch.pk)
+    directory.mkdir(parents=True, exist_ok=True)
+    for position, (upload, order) in enumerate(zip(files, orders)):
+        name = os.path.basename(upload.name)
+        with open(directory / f'{position:05d}__{order}__{name}', 'wb') as staged:
+            for chunk in upload.chunks():
+                staged.write(chunk)
+
+    transaction.on_commit(lambda: enqueue(batch.pk))
+    return batch
+
+
+def enqueue(batch_id):
+    """Submit every unclaimed staged file of a batch to the worker pool"""
+    directory = STAGING_DIR / str(batch_id)
+    if not directory.is_dir():
+        return 0
+    paths = sorted(path for path in directory.iterdir() if not path.name.endswith(CLAIMED_SUFFIX))
+    for path in paths:
+        run_in_background(_process, batch_id, path)
+    return len(paths)
+
+
+def run_in_background(function, *args):
+    """Call function(*args) on the worker pool - inline when UPLOAD_WORKERS is 0"""
+    if settings.UPLOAD_WORKERS <= 0:
+        function(*args)
+        return
+    _pool().submit(_run, function, args)
+
+
+def _run(function, args):
+    try:
+        function(*args)
+    except Exception as e:
+        logger.error(f"❌ Error in background job {function.__name__}: {str(e)}")
+    finally:
+        connection.close()
+
+
+def _process(batch_id, path):
+    """Create the model row for one staged file and count the outcome"""
+    claimed = path.with_name(path.name + CLAIMED_SUFFIX)
+    try:
+        path.rename(claimed)
+    except FileNotFoundError:
+        # Already taken by another worker
+        return
+
+    try:
+        batch = UploadBatch.objects.get(pk=batch_id)
+        UploadBatch.objects.filter(pk=batch_id, status='queued').update(status='processing')
+
+        parent_field, image_field, defaults = TARGETS[batch.target]
+        model = apps.get_model(batch.target)
+        _, order, name = path.name.split('__', 2)
+        instance = model(**{f'{parent_field}_id': batch.parent_id, **defaults})
+        if int(order):
+            instance.order = int(order)
+        with open(claimed, 'rb') as staged:
+            Image.open(staged).verify()
+            staged.seek(0)
+            # Assigned uncommitted like a form upload, so pre_save handlers (watermark) see a new file
+            setattr(instance, image_field, File(staged, name=name))
+            instance.save()
+
+        claimed.unlink()
+        UploadBatch.objects.filter(pk=batch_id).update(processed=F('processed') + 1)
+    except Exception as e:
+        name = path.name.split('__', 2)[-1]
+        logger.error(f"❌ Error processing upload {name} (batch {batch_id}): {str(e)}")
+        claimed.unlink(missing_ok=True)
+        UploadBatch.objects.filter(pk=batch_id).update(failed=F('failed') + 1, last_error=f'{name}: {e}')
+    finally:
+        _finish_if_complete(batch_id)
+
+
+def _finish_if_complete(batch_id):
+    complete = UploadBatch.objects.filter(
+        pk=batch_id,
+        status__in=['queued', 'processing'],
+        processed__gte=F('total') - F('failed'),
+    )
+    if not complete.exists():
+        return
+    complete.filter(failed=0).update(status='done', finished_at=timezone.now())
+    complete.update(status='failed', finished_at=timezone.now())
+
+    directory = STAGING_DIR / str(batch_id)
+    if directory.is_dir() and not any(directory.iterdir()):
+        directory.rmdir()
+
+
+def resume():
+    """
+    Queue the staged files of unfinished batches, releasing claims left by a
+    process that stopped mid-file. Only run this while no other process is
+    working on uploads.
+    """
+    queued = 0
+    for batch_id in UploadBatch.objects.filter(status__in=['queued', 'processing']).values_list('pk', flat=True):
+        directory = STAGING_DIR / str(batch_id)
+        if directory.is_dir():
+            for path in directory.iterdir():
+                if path.name.endswith(CLAIMED_SUFFIX):
+                    path.rename(path.with_name(path.name[:-len(CLAIMED_SUFFIX)]))
+        queued += enqueue(batch_id)
+    return queued
+
+
+def sweep():
+    """
+    Remove staging directories nobody will process: finished batches,
+    directories without a batch row for STALE_AFTER, and batches abandoned
+    for STALE_AFTER (marked failed, their remaining files counted as failures)
+    Returns the number of directories removed.
+    """
+    if not STAGING_DIR.is_dir():
+        return 0
+    batches = {
+        str(batch.pk): batch
+        for batch in UploadBatch.objects.filter(pk__in=[
+            int(path.name) for path in STAGING_DIR.iterdir() if path.name.isdigit()
+        ])
+    }
+    stale_before = timezone.now() - STALE_AFTER
+    removed = 0
+    for directory in STAGING_DIR.iterdir():
+        if not directory.is_dir():
+            continue
+        batch = batches.get(directory.name)
+        if batch is None:
+            # The row may belong to an admin transaction that hasn't committed yet
+            if directory.stat().st_mtime >= stale_before.timestamp():
+                continue
+        elif batch.status in ('queued', 'processing'):
+            if batch.created_at >= stale_before:
+                continue
+            left = sum(1 for _ in directory.iterdir())
+            UploadBatch.objects.filter(pk=batch.pk, status__in=['queued', 'processing']).update(
+                status='failed',
+                failed=F('failed') + left,
+                last_error=f'Abandoned with {left} unprocessed file(s)',
+                finished_at=timezone.now(),
+            )
+        shutil.rmtree(directory, ignore_errors=True)
+        removed += 1
+    return removed
+
+
+def wait():
+    """Block until every queued job has run, including jobs queued by those jobs"""
+    global _executor
+    while True:
+        with _executor_lock:
+            executor, _executor = _executor, None
+        if executor is None:
+            return
+        executor.shutdown(wait=True)
+
+
+def status(batch):
+    """JSON-ready progress of a batch"""
+    return {
+        'id': batch.pk,
+        'target': batch.target,
+        'parent_id': batch.parent_id,
+        'label': batch.label,
+        'status': batch.status,
+        'total': batch.total,
+        'processed': batch.processed,
+        'failed': batch.failed,
+        'percent': batch.percent,
+        'last_error': batch.last_error,
+        'created_at': batch.created_at.isoformat(),
+        'finished_at': batch.finished_at.isoformat() if batch.finished_at else None,
+    }
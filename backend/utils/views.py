@@ -0,0 +1,14 @@
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+from . import uploads
+from .models import UploadBatch
+
+
+@staff_member_required
+def upload_batch_status(request, batch_id):
+    """
+    Progress of a bulk image upload (Admin only)
+    """
+    batch = get_object_or_404(UploadBatch, pk=batch_id)
+    return JsonResponse(uploads.status(batch))